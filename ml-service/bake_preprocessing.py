@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Bake DETR input preprocessing into the ONNX graph
+Prepends BGR->RGB, uint8->float32, /255 and NHWC->NCHW so the service can feed raw
+OpenCV pixels; writes models/human+phone/model.uint8_input.onnx
+Requires the onnx package in addition to the service requirements
+"""
+
+import os
+import sys
+import onnx
+from onnx import TensorProto, helper, numpy_helper
+import numpy as np
+
+MODEL_DIR = os.path.join("models", "human+phone")
+BAKED_MODEL_PATH = os.path.join(MODEL_DIR, "model.uint8_input.onnx")
+INPUT_SIZE = 640
+
+def bake_preprocessing(model: onnx.ModelProto) -> onnx.ModelProto:
+    """Replace the float32 NCHW input with a uint8 NHWC BGR input feeding an in-graph preprocessing chain"""
+    graph = model.graph
+    old_input = graph.input[0]
+    input_name = old_input.name
+    nchw_name = f"{input_name}_nchw_f32"
+
+    # Everything that consumed the original input now reads the preprocessed tensor
+    for node in graph.node:
+        for i, name in enumerate(node.input):
+            if name == input_name:
+                node.input[i] = nchw_name
+
+    # Keep the batch axis as exported (dynamic axes keep micro-batching working)
+    batch_dim = old_input.type.tensor_type.shape.dim[0]
+    batch = batch_dim.dim_param if batch_dim.HasField("dim_param") else batch_dim.dim_value
+    new_input = helper.make_tensor_value_info(input_name, TensorProto.UINT8, [batch, INPUT_SIZE, INPUT_SIZE, 3])
+
+    graph.initializer.extend([
+        numpy_helper.from_array(np.array([2, 1, 0], dtype=np.int64), "preproc_bgr_to_rgb"),
+        numpy_helper.from_array(np.array(1.0 / 255.0, dtype=np.float32), "preproc_scale"),
+    ])
+    preprocessing = [
+        helper.make_node("Gather", [input_name, "preproc_bgr_to_rgb"], ["preproc_rgb"], axis=3),
+        helper.make_node("Cast", ["preproc_rgb"], ["preproc_f32"], to=TensorProto.FLOAT),
+        helper.make_node("Mul", ["preproc_f32", "preproc_scale"], ["preproc_norm"]),
+        helper.make_node("Transpose", ["preproc_norm"], [nchw_name], perm=[0, 3, 1, 2]),
+    ]
+    for i, node in enumerate(preprocessing):
+        graph.node.insert(i, node)
+
+    graph.input.remove(old_input)
+    graph.input.insert(0, new_input)
+    return model
+
+def main():
+    print("🧁 DETR Preprocessing Baking Tool")
+    print("=" * 50)
+
+    # Bake on top of the INT8 model when one has been produced
+    if len(sys.argv) > 1:
+        source_path = sys.argv[1]
+    elif os.path.exists(os.path.join(MODEL_DIR, "model.int8.onnx")):
+        source_path = os.path.join(MODEL_DIR, "model.int8.onnx")
+    else:
+        source_path = os.path.join(MODEL_DIR, "model.onnx")
+
+    if not os.path.exists(source_path):
+        print(f"❌ Model file not found: {source_path}")
+        return
+
+    model = onnx.load(source_path)
+    input_type = model.graph.input[0].type.tensor_type.elem_type
+    if input_type != TensorProto.FLOAT:
+        print(f"❌ Expected a float32 input, got {TensorProto.DataType.Name(input_type)} - already baked?")
+        return
+
+    print(f"📂 Source: {source_path}")
+    model = bake_preprocessing(model)
+    onnx.checker.check_model(model)
+    onnx.save(model, BAKED_MODEL_PATH)
+
+    print(f"✅ Model with uint8 NHWC input saved to {BAKED_MODEL_PATH}")
+    print("\n🚀 Restart the ML service to load it")
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,10 @@ Run this to train the detector with your demo images
 
 import os
 import sys
-from overlay_calibration import OverlayCalibrator, calibrate_from_files
+from overlay_calibration import OverlayCalibrator, calibrate_from_files, configure_console_logging
 
 def main():
+    configure_console_logging()
     print("🎯 Overlay Detection Calibration Tool")
     print("=" * 50)
     
@@ -4,19 +4,54 @@ FastAPI service for DETR-ResNet50 human detection
 Processes phone camera frames for malpractice detection
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Header
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 import onnxruntime as ort
 import cv2
 import numpy as np
 import base64
 from typing import List, Dict, Any, Optional
+import asyncio
 import time
 import os
 import json
-from overlay_detection import OverlayDetector, DetectionResult
+import logging
+import orjson
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from overlay_detection import OverlayDetector, DetectionResult, SessionState
 
-app = FastAPI(title="TrueSight ML Detection Service")
+try:
+    import numba
+except ImportError:  # Numba is optional - preprocessing falls back to NumPy
+    numba = None
+
+try:
+    import pybase64
+except ImportError:  # pybase64 is optional - its SIMD decoder is a drop-in for the stdlib one
+    pybase64 = None
+
+b64decode = pybase64.b64decode if pybase64 is not None else base64.b64decode
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):  # PyTurboJPEG and libturbojpeg are optional - OpenCV decodes otherwise
+    turbo_jpeg = None
+
+app = FastAPI(title="TrueSight ML Detection Service", default_response_class=ORJSONResponse)
+
+# Per-frame diagnostics go through the logger at DEBUG so they cost nothing in production
+# LOG_LEVEL=DEBUG brings them back; the default only reports alerts and errors
+logging.basicConfig(format="%(message)s")
+logger = logging.getLogger("truesight.ml")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING").upper()
+if isinstance(logging.getLevelName(LOG_LEVEL), int):  # Unknown names map to a "Level X" string
+    logger.setLevel(LOG_LEVEL)
+else:
+    logger.setLevel(logging.WARNING)
+    logger.warning("⚠️ Unknown LOG_LEVEL %r - using WARNING", LOG_LEVEL)
 
 # Global model sessions
 session = None  # DETR model for human/phone detection
@@ -24,13 +59,57 @@ depth_session = None  # MiDaS model for depth estimation
 overlay_detector = None  # Overlay detection instance
 
 # Frame history for persistent detection
-frame_history = {}
-alert_sent = {}  # Track which alerts have been sent to prevent duplicates
+room_state = {}  # room -> RoomState (detection history bitmasks, sent-alert flags, last detections)
+DWELL_INFERENCE_INTERVAL = 5  # With both alerts active, only every Nth frame runs DETR
+STATIC_FRAME_THRESHOLD = 3.0  # Mean abs difference of 32x32 gray thumbnails below which a frame counts as unchanged
+overlay_sessions = {}  # room -> SessionState (the overlay detector's tab-switch and demo tracking)
+depth_cache = {}  # room -> (thumbnail, time, analysis) of the last frame that went through MiDaS
+DEPTH_CACHE_TTL_S = 2.0  # Room geometry is re-estimated at least this often even if the scene looks static
 HUMAN_HISTORY_LENGTH = 4  # Number of frames to track for humans
 PHONE_HISTORY_LENGTH = 2  # Number of frames to track for phones
+HUMAN_HISTORY_MASK = (1 << HUMAN_HISTORY_LENGTH) - 1  # All bits set = detected in every tracked frame
+PHONE_HISTORY_MASK = (1 << PHONE_HISTORY_LENGTH) - 1
 HUMAN_MALPRACTICE_THRESHOLD = 1  # 1+ people = malpractice (any non-zero)
 PHONE_MALPRACTICE_THRESHOLD = 1  # 1+ additional phone = malpractice
 
+# Micro-batching of DETR inference across concurrent requests
+MAX_BATCH_SIZE = 8  # Upper bound on frames coalesced into one session.run
+BATCH_WINDOW_S = 0.005  # How long the batcher waits for more frames after the first one
+BATCH_POLL_S = 0.001  # How often the batcher checks for new frames inside that window
+detr_max_batch = 1  # Set by load_model from the model's batch axis (1 = static batch)
+detr_uint8_input = False  # Set by load_model when normalization is baked into the graph
+DETR_MODEL_FILES = ["model.uint8_input.onnx", "model.int8.onnx", "model.onnx"]  # In order of preference
+inference_queue = None  # asyncio.Queue of (input_tensor, future) pairs
+batch_worker_task = None
+inference_sem = None  # asyncio.Semaphore(1) - one ONNX Runtime run at a time across both models
+inference_pool = ThreadPoolExecutor(max_workers=1)  # Dedicated thread for session runs; ORT's intra-op pool does the fan-out
+preprocess_pool = ThreadPoolExecutor(max_workers=2)  # Decode/preprocess frame N+1 while frame N is in session.run
+overlay_pool = ThreadPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2))  # Overlay detection is pure OpenCV and releases the GIL
+numba_kernel_lock = threading.Lock()  # The kernel already uses every core, and not all numba threading layers are thread-safe
+
+# IOBinding state used when DETR runs on the GPU
+detr_io_binding = None
+detr_input_buffers = {}  # batch size -> persistent device OrtValue bound to the "image" input
+depth_io_binding = None
+depth_input_value = None  # Persistent device OrtValue for the MiDaS input
+
+# Reusable host-side input tensors so preprocessing doesn't allocate ~4.9MB per frame
+input_buffer_pool = []  # Free single-frame input tensors (see new_input_tensor), one taken per in-flight frame
+detr_batch_buffer = None  # [detr_max_batch, 3, 640, 640] staging area the batcher concatenates into
+depth_buffer_pool = []  # Free [1, 3, 384, 384] float32 MiDaS input tensors
+decode_buffer_pool = {}  # (height, width, 3) -> free BGR frames TurboJPEG decodes into
+DECODE_POOL_MAX_SHAPES = 4  # Cameras send a handful of resolutions; other sizes aren't pooled
+
+# Laptop screen masks per room: room -> (screen rects in 640x640 coordinates, frames since last scan)
+SCREEN_MASK_REFRESH_FRAMES = 30
+SCREEN_MORPH_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+SCREEN_SCAN_OPENCL = cv2.ocl.haveOpenCL()  # Run the screen scan through OpenCV's T-API when a device is available
+screen_mask_cache = {}
+
+# TensorRT engines are expensive to build, so they are cached next to the models
+TRT_ENGINE_CACHE_DIR = os.path.join("models", "trt_cache")
+WARMUP_RUNS = 3  # Dummy runs at load so arena growth and cuDNN/TensorRT tuning happen before the first request
+
 class FrameRequest(BaseModel):
     data: str  # base64 encoded image
     timestamp: int
@@ -54,7 +133,7 @@ class DepthAnalysisResult(BaseModel):
     depth_map_available: bool
     laptop_screen_detected: bool
     phone_to_laptop_distance: float  # in meters (estimated)
-    wall_boundaries: List[List[float]]  # List of wall boundary points
+    wall_boundaries: List[List[List[float]]]  # Wall boundary polygons, each a list of [x, y] points
     room_dimensions: Dict[str, float]  # width, height, depth estimates
     device_positions: Dict[str, Dict[str, float]]  # laptop, phone positions in room
     processing_time_ms: float
@@ -68,32 +147,99 @@ class OverlayDetectionResult(BaseModel):
     processing_time_ms: float
     timestamp: str
 
-# COCO class names (DETR is typically trained on COCO)
-COCO_CLASSES = [
-    "N/A", "person", "bicycle", "car", "motorcycle", "airplane", "bus", "train", "truck", "boat",
-    "traffic light", "fire hydrant", "N/A", "stop sign", "parking meter", "bench", "bird", "cat", "dog", "horse",
-    "sheep", "cow", "elephant", "bear", "zebra", "giraffe", "N/A", "backpack", "umbrella", "N/A", "N/A",
-    "handbag", "tie", "suitcase", "frisbee", "skis", "snowboard", "sports ball", "kite", "baseball bat",
-    "baseball glove", "skateboard", "surfboard", "tennis racket", "bottle", "N/A", "wine glass", "cup",
-    "fork", "knife", "spoon", "bowl", "banana", "apple", "sandwich", "orange", "broccoli", "carrot",
-    "hot dog", "pizza", "donut", "cake", "chair", "couch", "potted plant", "bed", "N/A", "dining table",
-    "N/A", "N/A", "toilet", "N/A", "tv", "laptop", "mouse", "remote", "keyboard", "cell phone",
-    "microwave", "oven", "toaster", "sink", "refrigerator", "N/A", "book", "clock", "vase", "scissors",
-    "teddy bear", "hair drier", "toothbrush"
-]
+# COCO class ids (DETR is typically trained on COCO); only these two are ever reported
+PERSON_CLASS_ID = 1
+PHONE_CLASS_ID = 77
+CLASS_NAMES = {PERSON_CLASS_ID: "person", PHONE_CLASS_ID: "cell phone"}
+
+def get_execution_providers() -> List:
+    """
+    Pick ONNX Runtime execution providers in order of preference
+    TensorRT (FP16, cached engines), then CUDA, then CPU
+    """
+    available = ort.get_available_providers()
+    providers = []
+    
+    if "TensorrtExecutionProvider" in available:
+        os.makedirs(TRT_ENGINE_CACHE_DIR, exist_ok=True)
+        providers.append(("TensorrtExecutionProvider", {
+            "trt_fp16_enable": True,
+            "trt_engine_cache_enable": True,
+            "trt_engine_cache_path": TRT_ENGINE_CACHE_DIR,
+        }))
+    
+    if "CUDAExecutionProvider" in available:
+        providers.append(("CUDAExecutionProvider", {
+            "device_id": 0,
+            "cudnn_conv_algo_search": "EXHAUSTIVE",  # Input shapes are fixed, so the one-off search pays for itself
+            "arena_extend_strategy": "kSameAsRequested",
+            "do_copy_in_default_stream": 1,
+        }))
+    
+    providers.append("CPUExecutionProvider")
+    return providers
+
+def get_session_options() -> ort.SessionOptions:
+    """
+    Session options tuned for one request-serialized model per process
+    Intra-op threads are pinned to the physical cores; inter-op parallelism only adds contention here
+    """
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+    options.inter_op_num_threads = 1
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.enable_mem_pattern = True
+    options.enable_cpu_mem_arena = True
+    options.add_session_config_entry("session.disable_prepacking", "0")
+    return options
+
+def create_session(model_path: str, providers: Optional[List] = None) -> ort.InferenceSession:
+    """
+    Create an ONNX Runtime session with tuned options
+    On CPU the fully optimized graph is saved as <model>.opt.onnx on first load and reused afterwards
+    """
+    if providers is None:
+        providers = get_execution_providers()
+    options = get_session_options()
+    
+    # GPU-optimized graphs contain EP-specific nodes, so only CPU sessions reuse the saved graph
+    if providers == ["CPUExecutionProvider"]:
+        optimized_path = os.path.splitext(model_path)[0] + ".opt.onnx"
+        if os.path.exists(optimized_path) and os.path.getmtime(optimized_path) >= os.path.getmtime(model_path):
+            model_path = optimized_path
+        else:
+            options.optimized_model_filepath = optimized_path
+    
+    return ort.InferenceSession(model_path, options, providers=providers)
+
+def create_preferred_session(model_paths: List[str]) -> tuple:
+    """
+    Create a session from the first of model_paths that loads, in order of preference
+    Returns (session, model_path); the last path's load error propagates
+    """
+    for model_path in model_paths[:-1]:
+        try:
+            return create_session(model_path), model_path
+        except Exception as e:
+            print(f"⚠️ Failed to load {model_path}, trying the next model: {e}")
+    return create_session(model_paths[-1]), model_paths[-1]
 
 def load_model():
     """Load the DETR ONNX model"""
-    global session
+    global session, detr_max_batch, detr_io_binding, detr_batch_buffer, detr_uint8_input
     
-    model_path = os.path.join("models", "human+phone", "model.onnx")
+    model_paths = [os.path.join("models", "human+phone", name) for name in DETR_MODEL_FILES]
+    model_paths = [path for path in model_paths if os.path.exists(path)]
     
-    if not os.path.exists(model_path):
-        raise Exception(f"Model file not found: {model_path}")
+    if not model_paths:
+        raise Exception(f"Model file not found: {os.path.join('models', 'human+phone', 'model.onnx')}")
     
     try:
-        session = ort.InferenceSession(model_path)
+        # Prefer the baked/INT8 variants from bake_preprocessing.py and quantize_detr.py, falling back to FP32
+        session, model_path = create_preferred_session(model_paths)
         print(f"✅ DETR model loaded from {model_path}")
+        print(f"⚙️ Execution providers: {session.get_providers()}")
         
         # Print model info
         inputs = session.get_inputs()
@@ -101,26 +247,67 @@ def load_model():
         print(f"📊 Model: {len(inputs)} inputs, {len(outputs)} outputs")
         print(f"  Input: {inputs[0].name} {inputs[0].shape}")
         
+        # Only batch across requests if the model was exported with a dynamic batch axis
+        batch_dim = inputs[0].shape[0]
+        detr_max_batch = 1 if isinstance(batch_dim, int) else MAX_BATCH_SIZE
+        print(f"📦 DETR micro-batching: up to {detr_max_batch} frame(s) per run")
+        
+        # A baked model takes raw uint8 BGR pixels in NHWC and normalizes in-graph
+        detr_uint8_input = inputs[0].type == "tensor(uint8)"
+        if detr_uint8_input:
+            print("🧁 DETR preprocessing baked into the graph (uint8 NHWC input)")
+        
+        # One input tensor per batch slot up front; the pool grows if more frames are in flight
+        input_buffer_pool[:] = [new_input_tensor() for _ in range(detr_max_batch)]
+        detr_batch_buffer = new_input_tensor(detr_max_batch) if detr_max_batch > 1 else None
+        
+        # On the GPU, keep the input in a persistent device buffer instead of a fresh copy per run
+        detr_input_buffers.clear()
+        if session.get_providers()[0] != "CPUExecutionProvider":
+            detr_io_binding = session.io_binding()
+            print("🔗 DETR IOBinding enabled")
+        else:
+            detr_io_binding = None
+        
+        warmup_detr()
         return True
     except Exception as e:
         print(f"❌ Failed to load model: {e}")
         return False
 
+def warmup_detr():
+    """Run DETR on blank frames so the first request doesn't pay the cold-start cost"""
+    start_time = time.time()
+    dummy = new_input_tensor()
+    dummy.fill(0)
+    for _ in range(WARMUP_RUNS):
+        run_detr_session(dummy)
+    # GPU providers tune per input shape, so the full micro-batch gets a pass too
+    if detr_batch_buffer is not None:
+        detr_batch_buffer.fill(0)
+        run_detr_session(detr_batch_buffer)
+    print(f"🔥 DETR warmed up in {(time.time() - start_time) * 1000:.0f}ms")
+
 def load_depth_model():
     """Load the MiDaS depth estimation ONNX model"""
-    global depth_session
+    global depth_session, depth_io_binding, depth_input_value
     
     # Assuming MiDaS model is placed in models/depth/
     depth_model_path = os.path.join("models", "depth", "model.onnx")
     
-    if not os.path.exists(depth_model_path):
+    # Prefer the INT8 model from quantize_depth.py, falling back to FP32
+    model_paths = [os.path.join("models", "depth", "model.int8.onnx"), depth_model_path]
+    model_paths = [path for path in model_paths if os.path.exists(path)]
+    
+    if not model_paths:
         print(f"⚠️ MiDaS depth model not found: {depth_model_path}")
         print("📝 Note: Place MiDaS ONNX model in models/depth/model.onnx for depth analysis")
         return False
     
     try:
-        depth_session = ort.InferenceSession(depth_model_path)
+        depth_session, depth_model_path = create_preferred_session(model_paths)
         print(f"✅ MiDaS depth model loaded from {depth_model_path}")
+        print(f"⚙️ Execution providers: {depth_session.get_providers()}")
         
         # Print model info
         inputs = depth_session.get_inputs()
@@ -128,96 +315,244 @@ def load_depth_model():
         print(f"📊 Depth Model: {len(inputs)} inputs, {len(outputs)} outputs")
         print(f"  Input: {inputs[0].name} {inputs[0].shape}")
         
+        depth_input_value = None
+        if depth_session.get_providers()[0] != "CPUExecutionProvider":
+            depth_io_binding = depth_session.io_binding()
+            print("🔗 MiDaS IOBinding enabled")
+        else:
+            depth_io_binding = None
+        
+        warmup_depth()
         return True
     except Exception as e:
         print(f"❌ Failed to load depth model: {e}")
         return False
 
-def mask_laptop_screens(image: np.ndarray) -> np.ndarray:
+def warmup_depth():
+    """Run MiDaS on a blank frame so the first request doesn't pay the cold-start cost"""
+    start_time = time.time()
+    dummy = np.zeros((1, 3, 384, 384), dtype=np.float32)
+    for _ in range(WARMUP_RUNS):
+        run_depth_session(dummy)
+    print(f"🔥 MiDaS warmed up in {(time.time() - start_time) * 1000:.0f}ms")
+
+# JPEG start-of-frame markers carrying the image dimensions (excludes DHT/JPG/DAC)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+def jpeg_dimensions(image_data: bytes) -> Optional[tuple]:
+    """
+    Read (width, height) from a JPEG header without decoding the image
+    Returns None for non-JPEG or malformed data
+    """
+    if image_data[:2] != b"\xff\xd8":
+        return None
+    
+    i = 2
+    while i + 9 < len(image_data):
+        if image_data[i] != 0xFF:
+            return None
+        marker = image_data[i + 1]
+        if marker == 0xFF:  # Fill byte
+            i += 1
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            height = int.from_bytes(image_data[i + 5:i + 7], "big")
+            width = int.from_bytes(image_data[i + 7:i + 9], "big")
+            return width, height
+        # Skip this segment (length includes the two length bytes)
+        i += 2 + int.from_bytes(image_data[i + 2:i + 4], "big")
+    
+    return None
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+def has_image_header(image_data: bytes) -> bool:
+    """Cheap plausibility check for frames that are not decoded: a parseable JPEG header or a PNG signature"""
+    return jpeg_dimensions(image_data) is not None or image_data[:8] == PNG_SIGNATURE
+
+IMREAD_SCALED_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+def decode_image(image_data: bytes, min_side: int = 0) -> Optional[np.ndarray]:
     """
-    Detect and mask laptop screen areas to prevent false human detection
+    Decode JPEG/PNG bytes to a BGR image
+    JPEGs whose shorter side is at least 2x, 4x or 8x min_side are decoded at reduced
+    scale by libjpeg's DCT scaling, which is much cheaper than decoding the full frame
+    only to shrink it to the model input size afterwards
     """
+    factor = 1
+    dimensions = jpeg_dimensions(image_data) if min_side or turbo_jpeg is not None else None
+    
+    if dimensions is not None and min_side:
+        factor = next((f for f in (8, 4, 2) if min(dimensions) // f >= min_side), 1)
+    
+    # libjpeg-turbo's TurboJPEG API decodes straight into a pooled frame with the same DCT scaling
+    if turbo_jpeg is not None and dimensions is not None:
+        width, height = dimensions
+        out = acquire_decode_buffer((-(-height // factor), -(-width // factor), 3))
+        try:
+            return turbo_jpeg.decode(image_data, pixel_format=TJPF_BGR, scaling_factor=(1, factor), dst=out)
+        except Exception:
+            release_decode_buffer(out)  # Let OpenCV try, which also returns None for data neither can decode
+    
+    # np.frombuffer wraps the request bytes without copying them
+    return cv2.imdecode(np.frombuffer(image_data, np.uint8), IMREAD_SCALED_FLAGS[factor])
+
+def acquire_decode_buffer(shape: tuple) -> np.ndarray:
+    """Take a decode target of the given shape from the pool, allocating if none is free"""
+    try:
+        return decode_buffer_pool[shape].pop()
+    except (KeyError, IndexError):
+        return np.empty(shape, dtype=np.uint8)
+
+def release_decode_buffer(image: np.ndarray):
+    """Return a decoded frame to the pool once nothing reads it anymore"""
+    free = decode_buffer_pool.get(image.shape)
+    if free is None:
+        if len(decode_buffer_pool) >= DECODE_POOL_MAX_SHAPES:
+            return
+        free = decode_buffer_pool.setdefault(image.shape, [])
+    if len(free) < MAX_BATCH_SIZE:
+        free.append(image)
+
+def find_laptop_screens(image: np.ndarray, scale_x: float = 1.0, scale_y: float = 1.0) -> List[tuple]:
+    """
+    Detect laptop screen areas that could cause false human detection
+    scale_x/scale_y map the original frame onto image, since the size and aspect
+    limits are tuned for full-resolution frames
+    Returns a list of (x, y, w, h) rectangles in image coordinates
+    """
+    # With OpenCL the filtering runs on the GPU (T-API) and only the final mask comes back to the host
+    source = cv2.UMat(image) if SCREEN_SCAN_OPENCL else image
+    
     # Convert to grayscale for screen detection
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    gray = cv2.cvtColor(source, cv2.COLOR_BGR2GRAY)
     
     # Find bright rectangular areas (typical screens)
     _, thresh = cv2.threshold(gray, 120, 255, cv2.THRESH_BINARY)
     
-    # Morphological operations to clean up
-    kernel = np.ones((5,5), np.uint8)
-    thresh = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
-    thresh = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)
+    min_area = 5000 * scale_x * scale_y
+    max_area = 100000 * scale_x * scale_y
     
-    # Find contours
-    contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    # Too few bright pixels for any screen - skip morphology and labelling
+    # (half the minimum leaves headroom for gaps the closing would fill)
+    if cv2.countNonZero(thresh) < min_area / 2:
+        return []
     
-    for contour in contours:
-        area = cv2.contourArea(contour)
-        
-        # Screen should be reasonably large
-        if 5000 < area < 100000:  # Adjust based on typical laptop screen size in frame
-            # Check if rectangular
-            epsilon = 0.02 * cv2.arcLength(contour, True)
-            approx = cv2.approxPolyDP(contour, epsilon, True)
-            
-            if len(approx) >= 4:  # Roughly rectangular
-                # Get bounding rectangle
-                x, y, w, h = cv2.boundingRect(contour)
-                
-                # Check aspect ratio (screens are typically 16:9 or 4:3)
-                aspect_ratio = w / h
-                if 1.2 < aspect_ratio < 2.0:  # Reasonable screen aspect ratio
-                    # Mask this area (gray it out)
-                    cv2.rectangle(image, (x, y), (x + w, y + h), (128, 128, 128), -1)
-                    print(f"🖥️ Masked screen area: {x},{y} {w}x{h} (aspect: {aspect_ratio:.2f})")
+    # Morphological operations to clean up
+    thresh = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, SCREEN_MORPH_KERNEL)
+    thresh = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, SCREEN_MORPH_KERNEL)
+    if SCREEN_SCAN_OPENCL:
+        thresh = thresh.get()
+    
+    # Label bright blobs with their area and bounding box in one pass (label 0 is the background)
+    _, _, stats, _ = cv2.connectedComponentsWithStats(thresh, connectivity=8)
+    stats = stats[1:]
+    
+    # Screen should be reasonably large - adjust based on typical laptop screen size in frame
+    area = stats[:, cv2.CC_STAT_AREA]
+    candidates = stats[(area > min_area) & (area < max_area)]
+    
+    # Check aspect ratio (screens are typically 16:9 or 4:3)
+    widths = candidates[:, cv2.CC_STAT_WIDTH]
+    heights = candidates[:, cv2.CC_STAT_HEIGHT]
+    aspect_ratios = (widths / scale_x) / (heights / scale_y)
+    screens = candidates[(aspect_ratios > 1.2) & (aspect_ratios < 2.0)]
+    
+    return [
+        (int(x), int(y), int(w), int(h))
+        for x, y, w, h in screens[:, [cv2.CC_STAT_LEFT, cv2.CC_STAT_TOP, cv2.CC_STAT_WIDTH, cv2.CC_STAT_HEIGHT]]
+    ]
+
+def mask_laptop_screens(image: np.ndarray, screens: List[tuple]) -> np.ndarray:
+    """
+    Gray out detected laptop screen areas in place to prevent false human detection
+    """
+    for x, y, w, h in screens:
+        cv2.rectangle(image, (x, y), (x + w, y + h), (128, 128, 128), -1)
+        logger.debug("🖥️ Masked screen area: %d,%d %dx%d", x, y, w, h)
     
     return image
 
-def preprocess_depth_image(image: np.ndarray) -> np.ndarray:
+def get_screen_rects(room: str, image: np.ndarray, scale_x: float, scale_y: float) -> List[tuple]:
+    """
+    Return the laptop screen rectangles for a room
+    The camera is fixed during an interview, so the scan only reruns every SCREEN_MASK_REFRESH_FRAMES frames
+    """
+    cached = screen_mask_cache.get(room)
+    if cached is not None and cached[1] < SCREEN_MASK_REFRESH_FRAMES:
+        screen_mask_cache[room] = (cached[0], cached[1] + 1)
+        return cached[0]
+    
+    screens = find_laptop_screens(image, scale_x, scale_y)
+    screen_mask_cache[room] = (screens, 1)
+    return screens
+
+def preprocess_depth_image(image: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Preprocess image for MiDaS depth estimation
     MiDaS typically expects RGB input of specific size (384x384 for MiDaS v2)
+    Output: Tensor [1, 3, 384, 384] (RGB, normalized), written into out when given
     """
-    # Resize image to MiDaS input size (assuming 384x384)
-    target_size = (384, 384)
-    resized = cv2.resize(image, target_size)
-    
-    # Convert BGR to RGB (OpenCV uses BGR, MiDaS expects RGB)
-    rgb_image = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
+    if out is None:
+        out = np.empty((1, 3, 384, 384), dtype=np.float32)
     
-    # Normalize to [0, 1] range
-    normalized = rgb_image.astype(np.float32) / 255.0
+    # Resize image to MiDaS input size (assuming 384x384)
+    resized = cv2.resize(image, (384, 384))
     
-    # MiDaS expects CHW format (channels first) and batch dimension
-    chw_image = np.transpose(normalized, (2, 0, 1))  # HWC to CHW
-    batch_image = np.expand_dims(chw_image, axis=0)  # Add batch dimension
+    if numba is not None:
+        # Swap channels (MiDaS expects RGB), normalize and transpose in one pass
+        with numba_kernel_lock:
+            bgr_u8_to_chw_f32_norm(resized, out)
+        return out
     
-    return batch_image
+    # BGR to RGB, normalize to [0, 1] and HWC to NCHW in one OpenCV call
+    out[...] = cv2.dnn.blobFromImage(resized, scalefactor=1.0 / 255.0, swapRB=True, crop=False)
+    return out
 
 def analyze_depth_map(depth_map: np.ndarray, original_image: np.ndarray) -> Dict[str, Any]:
     """
     Analyze depth map to extract room information and device positions
+    The statistics the helpers need are gathered once here instead of each helper re-walking the map
     """
-    # Normalize depth map for analysis
-    depth_normalized = (depth_map - depth_map.min()) / (depth_map.max() - depth_map.min())
+    h, w = depth_map.shape
     
-    # Convert to 8-bit for OpenCV operations
-    depth_8bit = (depth_normalized * 255).astype(np.uint8)
+    # One min/max pass serves both the room-size estimate and the 8-bit normalization
+    min_depth, max_depth, _, _ = cv2.minMaxLoc(depth_map)
+    
+    # Normalize depth map to 8-bit for OpenCV operations: same float32 steps and truncation as
+    # before, done in place on one temporary, and all zeros on a flat map instead of NaN
+    if max_depth > min_depth:
+        low, high = np.float32(min_depth), np.float32(max_depth)
+        depth_scaled = depth_map - low
+        depth_scaled /= high - low
+        depth_scaled *= 255
+        depth_8bit = depth_scaled.astype(np.uint8)
+    else:
+        depth_8bit = np.zeros(depth_map.shape, dtype=np.uint8)
+    
+    # Center-region statistics, where the laptop screen typically sits
+    center_depth = float(cv2.mean(depth_map[h//4:3*h//4, w//4:3*w//4])[0])
+    center_mean_8bit, center_std_8bit = cv2.meanStdDev(depth_8bit[h//4:3*h//4, w//4:3*w//4])
     
     # Detect laptop screen (typically a rectangular bright area in the center)
-    laptop_screen_detected = detect_laptop_screen(depth_8bit, original_image)
+    laptop_screen_detected = detect_laptop_screen(float(center_mean_8bit[0][0]), float(center_std_8bit[0][0]))
     
     # Estimate phone to laptop distance
-    phone_to_laptop_distance = estimate_phone_to_laptop_distance(depth_map, laptop_screen_detected)
+    phone_to_laptop_distance = estimate_phone_to_laptop_distance(center_depth, laptop_screen_detected)
     
     # Detect wall boundaries (areas with maximum depth)
     wall_boundaries = detect_wall_boundaries(depth_8bit)
     
     # Estimate room dimensions
-    room_dimensions = estimate_room_dimensions(depth_map)
+    room_dimensions = estimate_room_dimensions(max_depth)
     
     # Estimate device positions
-    device_positions = estimate_device_positions(depth_map, laptop_screen_detected)
+    device_positions = estimate_device_positions((h, w), center_depth, laptop_screen_detected)
     
     return {
         "laptop_screen_detected": laptop_screen_detected,
@@ -227,43 +562,34 @@ def analyze_depth_map(depth_map: np.ndarray, original_image: np.ndarray) -> Dict
         "device_positions": device_positions
     }
 
-def detect_laptop_screen(depth_map: np.ndarray, original_image: np.ndarray) -> bool:
+def detect_laptop_screen(mean_depth: float, std_depth: float) -> bool:
     """
-    Detect laptop screen in the image using depth and brightness cues
+    Detect laptop screen from the 8-bit depth statistics of the center region
     """
-    h, w = depth_map.shape
-    center_region = depth_map[h//4:3*h//4, w//4:3*w//4]
-    
     # Look for rectangular regions with consistent depth (screen surface)
     # This is a simplified detection - in practice, you'd use more sophisticated methods
-    mean_depth = np.mean(center_region)
-    std_depth = np.std(center_region)
     
     # If center region has low depth variance, likely a flat surface (screen)
     return std_depth < 0.1 and mean_depth < 0.7  # Thresholds to be tuned
 
-def estimate_phone_to_laptop_distance(depth_map: np.ndarray, laptop_detected: bool) -> float:
+def estimate_phone_to_laptop_distance(center_depth: float, laptop_detected: bool) -> float:
     """
     Estimate distance from phone to laptop screen
+    center_depth: average depth in the center region (where laptop screen likely is)
     """
     if not laptop_detected:
         return -1.0  # Unable to determine
     
-    h, w = depth_map.shape
-    center_region = depth_map[h//4:3*h//4, w//4:3*w//4]
-    
-    # Average depth in center region (where laptop screen likely is)
-    avg_depth = np.mean(center_region)
-    
     # Convert normalized depth to approximate real-world distance
     # This is a rough approximation - would need calibration in practice
-    estimated_distance = avg_depth * 3.0  # Assuming max depth represents ~3 meters
+    estimated_distance = center_depth * 3.0  # Assuming max depth represents ~3 meters
     
     return float(estimated_distance)
 
-def detect_wall_boundaries(depth_map: np.ndarray) -> List[List[float]]:
+def detect_wall_boundaries(depth_map: np.ndarray) -> List[List[List[float]]]:
     """
     Detect wall boundaries from depth map
+    Returns one polygon of [x, y] points per wall region
     """
     # Find contours of areas with maximum depth (walls/background)
     threshold = int(np.max(depth_map) * 0.8)  # Areas with depth > 80% of max
@@ -277,21 +603,14 @@ def detect_wall_boundaries(depth_map: np.ndarray) -> List[List[float]]:
         if cv2.contourArea(contour) > 1000:  # Filter small contours
             epsilon = 0.02 * cv2.arcLength(contour, True)
             approx = cv2.approxPolyDP(contour, epsilon, True)
-            boundary_points = [[float(pt[0][0]), float(pt[0][1])] for pt in approx]
-            boundaries.append(boundary_points)
+            boundaries.append(approx.reshape(-1, 2).astype(np.float32).tolist())
     
     return boundaries
 
-def estimate_room_dimensions(depth_map: np.ndarray) -> Dict[str, float]:
+def estimate_room_dimensions(max_depth: float) -> Dict[str, float]:
     """
-    Estimate room dimensions from depth map
+    Estimate room dimensions from the maximum depth in the map
     """
-    h, w = depth_map.shape
-    
-    # Simple estimation based on depth map analysis
-    max_depth = float(np.max(depth_map))
-    avg_depth = float(np.mean(depth_map))
-    
     # These are rough estimates - would need proper calibration
     estimated_width = max_depth * 1.5  # Rough approximation
     estimated_height = max_depth * 1.2  # Assuming standard ceiling height
@@ -303,11 +622,11 @@ def estimate_room_dimensions(depth_map: np.ndarray) -> Dict[str, float]:
         "depth": estimated_depth
     }
 
-def estimate_device_positions(depth_map: np.ndarray, laptop_detected: bool) -> Dict[str, Dict[str, float]]:
+def estimate_device_positions(shape: tuple, center_depth: float, laptop_detected: bool) -> Dict[str, Dict[str, float]]:
     """
     Estimate positions of laptop and phone in the room
     """
-    h, w = depth_map.shape
+    h, w = shape
     
     positions = {
         "phone": {"x": 0.0, "y": 0.0, "z": 0.0},  # Phone is at origin (camera position)
@@ -320,192 +639,260 @@ def estimate_device_positions(depth_map: np.ndarray, laptop_detected: bool) -> D
         center_y = h // 2
         
         # Convert image coordinates to room coordinates (simplified)
-        laptop_depth = float(np.mean(depth_map[h//4:3*h//4, w//4:3*w//4]))
-        
         positions["laptop"] = {
             "x": (center_x - w//2) / w * 2.0,  # Normalized x position
             "y": (center_y - h//2) / h * 1.5,  # Normalized y position  
-            "z": laptop_depth * 3.0  # Estimated z distance
+            "z": center_depth * 3.0  # Estimated z distance
         }
     
     return positions
 
-def preprocess_image(image: np.ndarray) -> np.ndarray:
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def bgr_u8_to_chw_f32_norm(src_u8: np.ndarray, dst_f32: np.ndarray) -> None:
+        """
+        Fused BGR->RGB, /255 and HWC->CHW in a single pass
+        src_u8: [H, W, 3] uint8 BGR, dst_f32: [1, 3, H, W] float32 RGB
+        """
+        height, width = src_u8.shape[0], src_u8.shape[1]
+        for y in numba.prange(height):
+            for x in range(width):
+                for c_out in range(3):
+                    dst_f32[0, c_out, y, x] = src_u8[y, x, 2 - c_out] * (1.0 / 255.0)
+
+def new_input_tensor(batch_size: int = 1) -> np.ndarray:
+    """Allocate a DETR input: [N, 640, 640, 3] uint8 for baked models, else [N, 3, 640, 640] float32"""
+    if detr_uint8_input:
+        return np.empty((batch_size, 640, 640, 3), dtype=np.uint8)
+    return np.empty((batch_size, 3, 640, 640), dtype=np.float32)
+
+def acquire_input_buffer() -> np.ndarray:
+    """Take an input tensor from the pool, allocating only if it is empty"""
+    try:
+        return input_buffer_pool.pop()
+    except IndexError:
+        return new_input_tensor()
+
+def release_input_buffer(buffer: np.ndarray):
+    """Return a tensor to the pool once its frame has been through inference"""
+    if len(input_buffer_pool) < MAX_BATCH_SIZE * 2:
+        input_buffer_pool.append(buffer)
+
+def release_depth_buffer(buffer: Optional[np.ndarray]):
+    """Return a MiDaS input tensor to the pool, whether or not its request succeeded"""
+    if buffer is not None and len(depth_buffer_pool) < MAX_BATCH_SIZE:
+        depth_buffer_pool.append(buffer)
+
+def preprocess_image(image: np.ndarray, room: str = "default", out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Preprocess image for DETR model
     Input: OpenCV image (BGR, any size)
-    Output: Tensor [1, 3, 640, 640] (RGB, normalized)
+    Output: Tensor [1, 3, 640, 640] (RGB, normalized), written into out when given
+    A uint8 out of shape [1, 640, 640, 3] instead receives the raw BGR pixels for a baked model
+    The frame keeps its aspect ratio and is zero-padded on the bottom/right, like DETR's training inputs
     """
-    # Apply screen masking to prevent false detections
-    image = mask_laptop_screens(image.copy())
-    
-    # Resize to model input size
-    image = cv2.resize(image, (640, 640))
-    
-    # BGR to RGB
-    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    
-    # Normalize to [0, 1]
-    image = image.astype(np.float32) / 255.0
-    
-    # HWC to CHW (Height-Width-Channel to Channel-Height-Width)
-    image = np.transpose(image, (2, 0, 1))
-    
-    # Add batch dimension
-    image = np.expand_dims(image, axis=0)
-    
-    return image
+    if out is None:
+        out = np.empty((1, 3, 640, 640), dtype=np.float32)
+    
+    height, width = image.shape[:2]
+    scale = 640 / max(height, width)
+    new_width, new_height = round(width * scale), round(height * scale)
+    
+    if (new_width, new_height) != (width, height):
+        # INTER_AREA averages away aliasing when shrinking HD frames
+        interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+        image = cv2.resize(image, (new_width, new_height), interpolation=interpolation)
+    
+    # Apply screen masking on the resized frame to prevent false detections
+    # (in place - a frame that needed no resize is grayed out in the caller's array too)
+    screens = get_screen_rects(room, image, scale, scale)
+    image = mask_laptop_screens(image, screens)
+    
+    if out.dtype == np.uint8:
+        # The graph does the channel swap, normalization and transpose
+        out[0, new_height:] = 0
+        out[0, :new_height, new_width:] = 0
+        out[0, :new_height, :new_width] = image
+        return out
+    
+    # Pooled buffers may hold a frame with a different aspect, so clear the padding every time
+    out[:, :, new_height:, :] = 0
+    out[:, :, :new_height, new_width:] = 0
+    region = out[:, :, :new_height, :new_width]
+    
+    if numba is not None:
+        # Swap channels, normalize and transpose in one pass
+        with numba_kernel_lock:
+            bgr_u8_to_chw_f32_norm(image, region)
+        return out
+    
+    # BGR to RGB, normalize to [0, 1] and HWC to NCHW in one OpenCV call
+    region[...] = cv2.dnn.blobFromImage(image, scalefactor=1.0 / 255.0, swapRB=True, crop=False)
+    
+    return out
 
-def filter_real_humans(humans: List[Detection], image_shape: tuple) -> List[Detection]:
+def filter_real_humans(boxes: np.ndarray, confidences: np.ndarray, image_shape: tuple) -> tuple:
     """
     Filter out humans that are likely on screens based on size and position
+    boxes are (N, 4) x1, y1, x2, y2 in the frame described by image_shape
+    Returns (boxes, confidences) of the humans that pass
     """
-    real_humans = []
     image_area = image_shape[0] * image_shape[1]
     
-    for human in humans:
-        x1, y1, x2, y2 = human.bbox
-        
-        # Calculate human properties
-        width = x2 - x1
-        height = y2 - y1
-        area = width * height
-        relative_size = area / image_area
-        
-        # Real humans should be:
-        # 1. Reasonably large (not tiny like people on screens)
-        # 2. Have proper aspect ratio (height > width for standing people)
-        aspect_ratio = height / width if width > 0 else 0
-        
-        # Filter criteria (more lenient for phone cameras)
-        is_large_enough = relative_size > 0.02  # At least 2% of image (was 5%)
-        is_proper_aspect = 0.5 < aspect_ratio < 4.0  # More flexible proportions
-        
-        if is_large_enough and is_proper_aspect:
-            real_humans.append(human)
-            print(f"✅ Real human detected: size={relative_size:.1%}, aspect={aspect_ratio:.2f}")
-        else:
-            print(f"🔍 Filtered out screen human: size={relative_size:.1%}, aspect={aspect_ratio:.2f}")
-    
-    return real_humans
+    # Calculate human properties
+    width = boxes[:, 2] - boxes[:, 0]
+    height = boxes[:, 3] - boxes[:, 1]
+    relative_size = width * height / image_area
+    
+    # Real humans should be:
+    # 1. Reasonably large (not tiny like people on screens)
+    # 2. Have proper aspect ratio (height > width for standing people)
+    aspect_ratio = np.divide(height, width, out=np.zeros_like(height), where=width > 0)
+    
+    # Filter criteria (more lenient for phone cameras)
+    is_large_enough = relative_size > 0.02  # At least 2% of image (was 5%)
+    is_proper_aspect = (aspect_ratio > 0.5) & (aspect_ratio < 4.0)  # More flexible proportions
+    keep = is_large_enough & is_proper_aspect
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        for kept, size, aspect in zip(keep, relative_size, aspect_ratio):
+            if kept:
+                logger.debug("✅ Real human detected: size=%.1f%%, aspect=%.2f", size * 100, aspect)
+            else:
+                logger.debug("🔍 Filtered out screen human: size=%.1f%%, aspect=%.2f", size * 100, aspect)
+    
+    return boxes[keep], confidences[keep]
 
 def postprocess_detections(boxes: np.ndarray, logits: np.ndarray, classes: np.ndarray, 
                           confidence_threshold: float = 0.3, image_shape: tuple = (640, 640)) -> tuple:
     """
     Process DETR model outputs - focus only on humans and cell phones
+    Returns (human_boxes, human_confidences, phone_boxes, phone_confidences) as NumPy arrays
     """
-    humans = []
-    cell_phones = []
-    
-    for i in range(len(boxes[0])):  # 100 detections
-        bbox = boxes[0][i]
-        confidence = float(logits[0][i])
-        class_id = int(classes[0][i])
-        
-        # Filter by confidence
-        if confidence < confidence_threshold:
-            continue
-        
-        # Only process humans and cell phones
-        if class_id == 1:  # Person class
-            class_name = "person"
-            detection = Detection(
-                class_name=class_name,
-                confidence=confidence,
-                bbox=bbox.tolist()
-            )
-            humans.append(detection)
-            
-        elif class_id == 77:  # Cell phone class in COCO
-            class_name = "cell phone"
-            detection = Detection(
-                class_name=class_name,
-                confidence=confidence,
-                bbox=bbox.tolist()
-            )
-            cell_phones.append(detection)
+    detection_boxes = boxes[0]
+    confidences = logits[0]
+    class_ids = classes[0]  # Compared in place; no need for an int32 copy
+    
+    # Filter by confidence, then keep only humans and cell phones
+    keep = confidences >= confidence_threshold
+    human_mask = keep & (class_ids == PERSON_CLASS_ID)
+    phone_mask = keep & (class_ids == PHONE_CLASS_ID)
+    
+    human_boxes, human_confidences = detection_boxes[human_mask], confidences[human_mask]
+    phone_boxes, phone_confidences = detection_boxes[phone_mask], confidences[phone_mask]
+    
+    # Boxes are in letterboxed input pixels; stretch them back onto the full 640x640 frame
+    height, width = image_shape[:2]
+    if height != width:
+        longest = max(height, width)
+        box_scale = np.array([longest / width, longest / height] * 2, dtype=np.float32)
+        human_boxes = np.clip(human_boxes * box_scale, 0, 640)
+        phone_boxes = np.clip(phone_boxes * box_scale, 0, 640)
     
     # For demo: no filtering, just return all detected humans
-    print(f"🔍 Raw detection: {len(humans)} humans, {len(cell_phones)} phones")
+    logger.debug("🔍 Raw detection: %d humans, %d phones", len(human_boxes), len(phone_boxes))
     
-    return humans, cell_phones
+    return human_boxes, human_confidences, phone_boxes, phone_confidences
 
-def update_detection_history(room: str, human_count: int, phone_count: int) -> tuple:
+def build_detections(class_name: str, boxes: np.ndarray, confidences: np.ndarray) -> List[dict]:
+    """
+    Convert detection arrays to Detection-shaped dicts
+    NumPy values are left as-is for ORJSONResponse to serialize natively
+    """
+    return [
+        {"class_name": class_name, "confidence": confidence, "bbox": bbox}
+        for bbox, confidence in zip(boxes, confidences)
+    ]
+
+class RoomState:
+    """Per-room detection history (newest frame in bit 0), sent-alert flags and last DETR result"""
+    __slots__ = ("humans_bits", "phones_bits", "human_alert_sent", "phone_alert_sent",
+                 "thumbnail", "detections", "frame_count")
+    
+    def __init__(self):
+        self.humans_bits = 0
+        self.phones_bits = 0
+        self.human_alert_sent = False  # Track which alerts have been sent to prevent duplicates
+        self.phone_alert_sent = False
+        self.thumbnail = None  # 32x32 gray thumbnail of the last frame that went through DETR
+        self.detections = None  # postprocess_detections output for that frame
+        self.frame_count = 0  # Frames received, paces inference while both alerts are active
+
+def get_room_state(room: str) -> RoomState:
+    """Return the state for a room, creating it on first use"""
+    state = room_state.get(room)
+    if state is None:
+        state = room_state[room] = RoomState()
+    return state
+
+def get_overlay_session(room: str) -> SessionState:
+    """Return the overlay detector session for a room, creating it on first use"""
+    overlay_session = overlay_sessions.get(room)
+    if overlay_session is None:
+        overlay_session = overlay_sessions[room] = SessionState()
+    return overlay_session
+
+def update_detection_history(room: str, human_count: int, phone_count: int,
+                             state: Optional[RoomState] = None) -> tuple:
     """
     Update detection history and check for NEW persistent malpractice
+    Pass the room's state when the caller already has it to skip the lookup
     Returns (new_human_malpractice, new_phone_malpractice) - only True when first detected
     """
-    if room not in frame_history:
-        frame_history[room] = {
-            'humans': [],
-            'phones': []
-        }
+    if state is None:
+        state = get_room_state(room)
     
-    if room not in alert_sent:
-        alert_sent[room] = {
-            'human_alert_sent': False,
-            'phone_alert_sent': False
-        }
-    
-    # Add current counts to history
-    frame_history[room]['humans'].append(human_count >= HUMAN_MALPRACTICE_THRESHOLD)
-    frame_history[room]['phones'].append(phone_count >= PHONE_MALPRACTICE_THRESHOLD)
-    
-    # Keep only recent frames
-    if len(frame_history[room]['humans']) > HUMAN_HISTORY_LENGTH:
-        frame_history[room]['humans'] = frame_history[room]['humans'][-HUMAN_HISTORY_LENGTH:]
-    
-    if len(frame_history[room]['phones']) > PHONE_HISTORY_LENGTH:
-        frame_history[room]['phones'] = frame_history[room]['phones'][-PHONE_HISTORY_LENGTH:]
+    # Shift current detections into the history, dropping frames older than the window
+    human_bits = ((state.humans_bits << 1) | (human_count >= HUMAN_MALPRACTICE_THRESHOLD)) & HUMAN_HISTORY_MASK
+    phone_bits = ((state.phones_bits << 1) | (phone_count >= PHONE_MALPRACTICE_THRESHOLD)) & PHONE_HISTORY_MASK
+    state.humans_bits = human_bits
+    state.phones_bits = phone_bits
     
     # Check for persistent human malpractice (need 4 consecutive frames)
-    human_malpractice_active = (
-        len(frame_history[room]['humans']) >= HUMAN_HISTORY_LENGTH and
-        all(frame_history[room]['humans'][-HUMAN_HISTORY_LENGTH:])
-    )
+    human_malpractice_active = human_bits == HUMAN_HISTORY_MASK
     
     # Check for persistent phone malpractice (need 2 consecutive frames)  
-    phone_malpractice_active = (
-        len(frame_history[room]['phones']) >= PHONE_HISTORY_LENGTH and
-        all(frame_history[room]['phones'][-PHONE_HISTORY_LENGTH:])
-    )
+    phone_malpractice_active = phone_bits == PHONE_HISTORY_MASK
     
     # Only return True if this is a NEW detection (not already alerted)
-    new_human_malpractice = human_malpractice_active and not alert_sent[room]['human_alert_sent']
-    new_phone_malpractice = phone_malpractice_active and not alert_sent[room]['phone_alert_sent']
+    new_human_malpractice = human_malpractice_active and not state.human_alert_sent
+    new_phone_malpractice = phone_malpractice_active and not state.phone_alert_sent
     
     # Update alert status
     if new_human_malpractice:
-        alert_sent[room]['human_alert_sent'] = True
-        print(f"🚨 NEW HUMAN MALPRACTICE DETECTED in room {room}")
+        state.human_alert_sent = True
+        logger.info("🚨 NEW HUMAN MALPRACTICE DETECTED in room %s", room)
     
     if new_phone_malpractice:
-        alert_sent[room]['phone_alert_sent'] = True
-        print(f"📱 NEW PHONE MALPRACTICE DETECTED in room {room}")
+        state.phone_alert_sent = True
+        logger.info("📱 NEW PHONE MALPRACTICE DETECTED in room %s", room)
     
     # Reset alert status if malpractice is no longer active (for future detections)
     if not human_malpractice_active:
-        alert_sent[room]['human_alert_sent'] = False
+        state.human_alert_sent = False
     
     if not phone_malpractice_active:
-        alert_sent[room]['phone_alert_sent'] = False
+        state.phone_alert_sent = False
     
-    print(f"📊 Detection history for {room}:")
-    print(f"  Humans: {frame_history[room]['humans'][-4:]} (active: {human_malpractice_active}, new: {new_human_malpractice})")
-    print(f"  Phones: {frame_history[room]['phones'][-2:]} (active: {phone_malpractice_active}, new: {new_phone_malpractice})")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("📊 Detection history for %s:", room)
+        logger.debug("  Humans: %s (active: %s, new: %s)", format(human_bits, f"0{HUMAN_HISTORY_LENGTH}b"),
+                     human_malpractice_active, new_human_malpractice)
+        logger.debug("  Phones: %s (active: %s, new: %s)", format(phone_bits, f"0{PHONE_HISTORY_LENGTH}b"),
+                     phone_malpractice_active, new_phone_malpractice)
     
     return new_human_malpractice, new_phone_malpractice
 
-def analyze_malpractice(humans: List[Detection], cell_phones: List[Detection], room: str) -> tuple:
+def analyze_malpractice(current_human_count: int, current_phone_count: int, max_human_confidence: float,
+                        room: str, state: Optional[RoomState] = None) -> tuple:
     """
     Analyze detections for malpractice - only generate alerts for NEW detections
+    Only the counts and top human confidence matter here, so callers pass scalars instead of detections
     """
     alerts = []
-    current_human_count = len(humans)
-    current_phone_count = len(cell_phones)
     
     # Update detection history and check for NEW persistent malpractice
-    new_human_malpractice, new_phone_malpractice = update_detection_history(room, current_human_count, current_phone_count)
+    new_human_malpractice, new_phone_malpractice = update_detection_history(room, current_human_count, current_phone_count, state)
     
     # Only generate alerts for NEW malpractice detections
     malpractice_detected = False
@@ -513,101 +900,292 @@ def analyze_malpractice(humans: List[Detection], cell_phones: List[Detection], r
     if new_human_malpractice:
         alerts.append("🚨 Human detected")
         malpractice_detected = True
-        print(f"🚨 SENDING HUMAN MALPRACTICE ALERT for room {room}")
+        logger.warning("🚨 SENDING HUMAN MALPRACTICE ALERT for room %s", room)
     
     if new_phone_malpractice:
         alerts.append("📱 Smartphone detected")
         malpractice_detected = True
-        print(f"📱 SENDING PHONE MALPRACTICE ALERT for room {room}")
+        logger.warning("📱 SENDING PHONE MALPRACTICE ALERT for room %s", room)
     
     # If no NEW malpractice, return empty alerts (don't spam)
     if not malpractice_detected:
         alerts = []  # Empty - no alert to send
-        print(f"✅ No new malpractice detected for room {room}")
-    
-    # Calculate overall confidence
-    if humans:
-        confidence = max([h.confidence for h in humans])
-    else:
-        confidence = 0.0
+        logger.debug("✅ No new malpractice detected for room %s", room)
     
-    return alerts, malpractice_detected, confidence
+    return alerts, malpractice_detected, max_human_confidence
 
-@app.post("/detect-humans", response_model=MalpracticeResult)
-async def detect_humans(request: FrameRequest):
+def run_detr_session(batch: np.ndarray) -> list:
     """
-    Detect humans and malpractice in phone camera frame
+    Run DETR on a preprocessed batch
+    On the GPU the input is copied into a persistent device buffer bound via IOBinding
     """
-    if session is None:
-        raise HTTPException(status_code=503, detail="Model not loaded")
-    
-    start_time = time.time()
-    
-    try:
-        # Validate and decode base64 image
-        print(f"📥 Received frame request: {len(request.data)} chars")
-        print(f"📥 Base64 validation: starts_with_jpeg={request.data.startswith('/9j/')}")
+    if detr_io_binding is None:
+        return session.run(None, {"image": batch})
+    
+    input_value = detr_input_buffers.get(batch.shape[0])
+    if input_value is None:
+        input_value = ort.OrtValue.ortvalue_from_shape_and_type(list(batch.shape), batch.dtype, "cuda", 0)
+        detr_input_buffers[batch.shape[0]] = input_value
+    
+    input_value.update_inplace(batch)
+    detr_io_binding.bind_ortvalue_input("image", input_value)
+    # Outputs are rebound every run since their shape follows the batch size
+    detr_io_binding.clear_binding_outputs()
+    for output in session.get_outputs():
+        detr_io_binding.bind_output(output.name, "cpu")
+    session.run_with_iobinding(detr_io_binding)
+    return detr_io_binding.copy_outputs_to_cpu()
+
+def run_depth_session(tensor: np.ndarray) -> list:
+    """
+    Run MiDaS on a preprocessed frame
+    On the GPU the input is copied into a persistent device buffer bound via IOBinding
+    """
+    global depth_input_value
+    input_name = depth_session.get_inputs()[0].name
+    if depth_io_binding is None:
+        return depth_session.run(None, {input_name: tensor})
+    
+    if depth_input_value is None:
+        depth_input_value = ort.OrtValue.ortvalue_from_shape_and_type(list(tensor.shape), tensor.dtype, "cuda", 0)
+    
+    depth_input_value.update_inplace(np.ascontiguousarray(tensor))
+    depth_io_binding.bind_ortvalue_input(input_name, depth_input_value)
+    depth_io_binding.clear_binding_outputs()
+    for output in depth_session.get_outputs():
+        depth_io_binding.bind_output(output.name, "cpu")
+    depth_session.run_with_iobinding(depth_io_binding)
+    return depth_io_binding.copy_outputs_to_cpu()
+
+async def detr_batch_worker():
+    """
+    Coalesce queued DETR inputs into a single [N, 3, 640, 640] batch per session.run
+    and resolve each request's future with its slice of the outputs
+    """
+    while True:
+        items = [await inference_queue.get()]
         
-        try:
-            image_data = base64.b64decode(request.data)
-            print(f"📥 Decoded to {len(image_data)} bytes")
-        except Exception as e:
-            print(f"❌ Base64 decode error: {e}")
-            raise HTTPException(status_code=400, detail=f"Invalid base64 data: {str(e)}")
+        if detr_max_batch > 1:
+            # Give concurrent requests a short window to join this batch, dispatching early once it is full
+            # (polled rather than wait_for(queue.get()), which can drop an item on timeout before 3.12)
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + BATCH_WINDOW_S
+            while True:
+                while len(items) < detr_max_batch and not inference_queue.empty():
+                    items.append(inference_queue.get_nowait())
+                if len(items) >= detr_max_batch or loop.time() >= deadline:
+                    break
+                await asyncio.sleep(BATCH_POLL_S)
         
         try:
-            nparr = np.frombuffer(image_data, np.uint8)
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            if len(items) == 1:
+                batch = items[0][0]
+            else:
+                batch = np.concatenate([tensor for tensor, _ in items], axis=0,
+                                       out=detr_batch_buffer[:len(items)])
+            async with inference_sem:
+                boxes, logits, classes = await asyncio.get_running_loop().run_in_executor(
+                    inference_pool, run_detr_session, batch)
         except Exception as e:
-            print(f"❌ Image decode error: {e}")
-            raise HTTPException(status_code=400, detail=f"Failed to decode image: {str(e)}")
-        
-        if image is None:
-            raise HTTPException(status_code=400, detail="Failed to decode image - invalid JPEG data")
-        
-        print(f"📥 Successfully decoded image: {image.shape[1]}x{image.shape[0]} pixels")
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            continue
         
-        # Preprocess for DETR
+        for i, (_, future) in enumerate(items):
+            if not future.done():
+                future.set_result((boxes[i:i+1], logits[i:i+1], classes[i:i+1]))
+
+async def run_detr(input_tensor: np.ndarray) -> tuple:
+    """Queue a preprocessed frame for batched DETR inference and wait for its outputs"""
+    future = asyncio.get_running_loop().create_future()
+    await inference_queue.put((input_tensor, future))
+    return await future
+
+async def run_detection(image: np.ndarray, room: str) -> tuple:
+    """
+    Preprocess a decoded frame, run it through the DETR batcher and postprocess the outputs
+    Returns (human_boxes, human_confidences, phone_boxes, phone_confidences)
+    """
+    input_tensor = acquire_input_buffer()
+    try:
+        # Preprocess for DETR on a worker thread, overlapping with other frames' inference
         try:
-            input_tensor = preprocess_image(image)
-            print(f"📥 Preprocessed to tensor shape: {input_tensor.shape}")
+            await asyncio.get_running_loop().run_in_executor(
+                preprocess_pool, preprocess_image, image, room, input_tensor)
+            logger.debug("📥 Preprocessed to tensor shape: %s", input_tensor.shape)
         except Exception as e:
-            print(f"❌ Preprocessing error: {e}")
+            logger.error("❌ Preprocessing error: %s", e)
             raise HTTPException(status_code=500, detail=f"Image preprocessing failed: {str(e)}")
         
         # Run inference
         try:
-            print(f"🤖 Running DETR inference...")
-            outputs = session.run(None, {"image": input_tensor})
+            logger.debug("🤖 Running DETR inference...")
+            outputs = await run_detr(input_tensor)
             boxes, logits, classes = outputs
-            print(f"🤖 Inference complete. Outputs: {len(outputs)} tensors")
+            logger.debug("🤖 Inference complete. Outputs: %d tensors", len(outputs))
         except Exception as e:
-            print(f"❌ DETR inference error: {e}")
+            logger.error("❌ DETR inference error: %s", e)
             raise HTTPException(status_code=500, detail=f"Model inference failed: {str(e)}")
+    finally:
+        release_input_buffer(input_tensor)
+    
+    # Process detections (only humans and cell phones)
+    try:
+        detections = postprocess_detections(boxes, logits, classes, image_shape=image.shape[:2])
+        logger.debug("🔍 Detection results: %d humans, %d phones", len(detections[0]), len(detections[2]))
+    except Exception as e:
+        logger.error("❌ Postprocessing error: %s", e)
+        raise HTTPException(status_code=500, detail=f"Detection processing failed: {str(e)}")
+    
+    return detections
+
+def frame_thumbnail(image: np.ndarray) -> np.ndarray:
+    """32x32 grayscale thumbnail used to spot frames that haven't changed"""
+    return cv2.cvtColor(cv2.resize(image, (32, 32), interpolation=cv2.INTER_AREA),
+                        cv2.COLOR_BGR2GRAY).astype(np.int16)
+
+def is_static_frame(thumbnail: np.ndarray, previous: np.ndarray) -> bool:
+    """True when two thumbnails differ by less than sensor noise"""
+    return np.mean(np.abs(thumbnail - previous)) < STATIC_FRAME_THRESHOLD
+
+async def decode_and_detect(image_data: bytes, room: str, state: RoomState) -> tuple:
+    """
+    Decode a frame and run DETR on it unless it matches the room's last inferred frame
+    Returns (human_boxes, human_confidences, phone_boxes, phone_confidences)
+    """
+    try:
+        image = await asyncio.get_running_loop().run_in_executor(preprocess_pool, decode_image, image_data, 640)
+    except Exception as e:
+        logger.error("❌ Image decode error: %s", e)
+        raise HTTPException(status_code=400, detail=f"Failed to decode image: {str(e)}")
+    
+    if image is None:
+        raise HTTPException(status_code=400, detail="Failed to decode image - invalid JPEG data")
+    
+    logger.debug("📥 Successfully decoded image: %dx%d pixels", image.shape[1], image.shape[0])
+    
+    try:
+        # A proctoring camera is mostly static, so unchanged frames reuse the last DETR result
+        thumbnail = frame_thumbnail(image)
+        if state.detections is not None and is_static_frame(thumbnail, state.thumbnail):
+            logger.debug("⏭️ Static frame in %s, reusing previous detections", room)
+            return state.detections
+        
+        state.thumbnail = thumbnail
+        state.detections = await run_detection(image, room)
+        return state.detections
+    finally:
+        release_decode_buffer(image)
+
+async def detect_humans_in_jpeg(image_data: bytes, room: str, start_time: float) -> ORJSONResponse:
+    """
+    Shared /detect-humans pipeline: decode, preprocess, batched DETR inference, malpractice analysis
+    """
+    state = get_room_state(room)
+    state.frame_count += 1
+    
+    # Once both alerts have fired nothing observable changes until activity stops, so only every
+    # DWELL_INFERENCE_INTERVAL-th frame is decoded and run; those frames let the history clear
+    if (state.human_alert_sent and state.phone_alert_sent and state.detections is not None
+            and state.frame_count % DWELL_INFERENCE_INTERVAL != 0):
+        # The frame is never decoded here, so at least reject bodies the decode path would refuse
+        if not has_image_header(image_data):
+            raise HTTPException(status_code=400, detail="Failed to decode image - invalid JPEG data")
+        logger.debug("⏸️ Both alerts active in %s, dwelling on previous detections", room)
+        detections = state.detections
+    else:
+        detections = await decode_and_detect(image_data, room, state)
+    human_boxes, human_confidences, phone_boxes, phone_confidences = detections
+    
+    # Analyze for malpractice with frame history
+    max_human_confidence = float(human_confidences.max()) if len(human_confidences) else 0.0
+    alerts, malpractice_detected, confidence = analyze_malpractice(
+        len(human_confidences), len(phone_confidences), max_human_confidence, room, state
+    )
+    
+    processing_time = (time.time() - start_time) * 1000  # Convert to ms
+    
+    # Returned as a MalpracticeResult-shaped dict, skipping pydantic validation on the hot path
+    return ORJSONResponse({
+        "humans_detected": len(human_boxes),
+        "human_detections": build_detections(CLASS_NAMES[PERSON_CLASS_ID], human_boxes, human_confidences),
+        "other_objects": build_detections(CLASS_NAMES[PHONE_CLASS_ID], phone_boxes, phone_confidences),  # Only cell phones now
+        "malpractice_detected": malpractice_detected,
+        "alerts": alerts,
+        "confidence": confidence,
+        "processing_time_ms": processing_time
+    })
+
+def parse_frame_body(body: bytes) -> tuple:
+    """
+    Parse a FrameRequest JSON body without pydantic, which would re-scan the whole base64 string
+    Only the small metadata fields are type-checked; returns (data, room)
+    """
+    try:
+        payload = orjson.loads(body)
+        data = payload["data"]
+        room = payload.get("room", "default")
+    except (orjson.JSONDecodeError, KeyError, TypeError, AttributeError):
+        raise HTTPException(status_code=422, detail="Expected a JSON object with a base64 'data' field")
+    if not isinstance(data, str) or not isinstance(room, str):
+        raise HTTPException(status_code=422, detail="'data' and 'room' must be strings")
+    return data, room
+
+# The body is parsed by parse_frame_body, so its FrameRequest schema is declared for the docs by hand
+@app.post("/detect-humans", response_model=MalpracticeResult, deprecated=True,
+          openapi_extra={"requestBody": {"required": True,
+                                         "content": {"application/json": {"schema": FrameRequest.model_json_schema()}}}})
+async def detect_humans(request: Request):
+    """
+    Detect humans and malpractice in phone camera frame (FrameRequest JSON body)
+    Deprecated: prefer /detect-humans-raw, which skips the base64 round trip
+    """
+    if session is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    
+    start_time = time.time()
+    data, room = parse_frame_body(await request.body())
+    
+    try:
+        logger.debug("📥 Received frame request: %d chars", len(data))
         
-        # Process detections (only humans and cell phones)
         try:
-            humans, cell_phones = postprocess_detections(boxes, logits, classes, image_shape=image.shape[:2])
-            print(f"🔍 Detection results: {len(humans)} humans, {len(cell_phones)} phones")
+            image_data = b64decode(data, validate=False)
+            logger.debug("📥 Decoded to %d bytes", len(image_data))
         except Exception as e:
-            print(f"❌ Postprocessing error: {e}")
-            raise HTTPException(status_code=500, detail=f"Detection processing failed: {str(e)}")
+            logger.error("❌ Base64 decode error: %s", e)
+            raise HTTPException(status_code=400, detail=f"Invalid base64 data: {str(e)}")
         
-        # Analyze for malpractice with frame history
-        alerts, malpractice_detected, confidence = analyze_malpractice(humans, cell_phones, request.room)
+        return await detect_humans_in_jpeg(image_data, room, start_time)
         
-        processing_time = (time.time() - start_time) * 1000  # Convert to ms
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
+
+@app.post("/detect-humans-raw", response_model=MalpracticeResult)
+async def detect_humans_raw(request: Request, room: str = "default", timestamp: Optional[int] = None,
+                            x_room: Optional[str] = Header(None), x_timestamp: Optional[int] = Header(None)):
+    """
+    Detect humans and malpractice in a phone camera frame sent as raw JPEG bytes
+    (Content-Type: application/octet-stream, room/timestamp in X-Room/X-Timestamp headers or the query string)
+    """
+    room = x_room or room
+    timestamp = x_timestamp or timestamp
+    if session is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    
+    start_time = time.time()
+    
+    try:
+        image_data = await request.body()
+        logger.debug("📥 Received raw frame for %s: %d bytes (client timestamp %s)", room, len(image_data), timestamp)
         
-        return MalpracticeResult(
-            humans_detected=len(humans),
-            human_detections=humans,
-            other_objects=cell_phones,  # Only cell phones now
-            malpractice_detected=malpractice_detected,
-            alerts=alerts,
-            confidence=confidence,
-            processing_time_ms=processing_time
-        )
+        return await detect_humans_in_jpeg(image_data, room, start_time)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
 
@@ -625,66 +1203,131 @@ async def analyze_depth(request: FrameRequest):
     try:
         # Decode base64 image
         try:
-            image_data = base64.b64decode(request.data)
-            image_array = np.frombuffer(image_data, np.uint8)
-            image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
+            image_data = b64decode(request.data, validate=False)
+            image = decode_image(image_data, min_side=384)
             
             if image is None:
                 raise ValueError("Failed to decode image")
                 
-            print(f"🖼️ Depth analysis - Image shape: {image.shape}")
+            logger.debug("🖼️ Depth analysis - Image shape: %s", image.shape)
             
         except Exception as e:
-            print(f"❌ Image decoding error: {e}")
+            logger.error("❌ Image decoding error: %s", e)
             raise HTTPException(status_code=400, detail=f"Invalid image data: {str(e)}")
         
-        # Preprocess image for MiDaS
         try:
-            processed_image = preprocess_depth_image(image)
-            print(f"📐 Preprocessed for depth: {processed_image.shape}")
+            # Room geometry doesn't change at frame rate, so an unchanged scene reuses the last analysis
+            thumbnail = frame_thumbnail(image)
+            cached = depth_cache.get(request.room)
+            if cached is not None and start_time - cached[1] < DEPTH_CACHE_TTL_S and is_static_frame(thumbnail, cached[0]):
+                logger.debug("⏭️ Static frame in %s, reusing previous depth analysis", request.room)
+                analysis_results = cached[2]
+            else:
+                analysis_results = await estimate_depth(image)
+                depth_cache[request.room] = (thumbnail, start_time, analysis_results)
+        finally:
+            release_decode_buffer(image)
+        
+        processing_time = (time.time() - start_time) * 1000  # Convert to ms
+        
+        # Returned as a DepthAnalysisResult-shaped dict, skipping pydantic validation
+        return ORJSONResponse({
+            "depth_map_available": True,
+            "laptop_screen_detected": analysis_results["laptop_screen_detected"],
+            "phone_to_laptop_distance": analysis_results["phone_to_laptop_distance"],
+            "wall_boundaries": analysis_results["wall_boundaries"],
+            "room_dimensions": analysis_results["room_dimensions"],
+            "device_positions": analysis_results["device_positions"],
+            "processing_time_ms": processing_time
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Depth analysis failed: {str(e)}")
+
+async def estimate_depth(image: np.ndarray) -> Dict[str, Any]:
+    """Run MiDaS on a decoded frame and analyze the depth map"""
+    # Preprocess image for MiDaS into a pooled tensor (concurrent requests each need their own)
+    processed_image = depth_buffer_pool.pop() if depth_buffer_pool else None
+    try:
+        try:
+            processed_image = preprocess_depth_image(image, out=processed_image)
+            logger.debug("📐 Preprocessed for depth: %s", processed_image.shape)
         except Exception as e:
-            print(f"❌ Depth preprocessing error: {e}")
+            logger.error("❌ Depth preprocessing error: %s", e)
             raise HTTPException(status_code=500, detail=f"Image preprocessing failed: {str(e)}")
         
         # Run MiDaS depth estimation
         try:
-            input_name = depth_session.get_inputs()[0].name
-            outputs = depth_session.run(None, {input_name: processed_image})
+            async with inference_sem:
+                outputs = await asyncio.get_running_loop().run_in_executor(
+                    inference_pool, run_depth_session, processed_image)
             depth_map = outputs[0][0]  # Remove batch dimension
             
-            print(f"📊 Depth map shape: {depth_map.shape}")
-            print(f"📊 Depth range: {depth_map.min():.3f} to {depth_map.max():.3f}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📊 Depth map shape: %s", depth_map.shape)
+                logger.debug("📊 Depth range: %.3f to %.3f", depth_map.min(), depth_map.max())
             
         except Exception as e:
-            print(f"❌ MiDaS inference error: {e}")
+            logger.error("❌ MiDaS inference error: %s", e)
             raise HTTPException(status_code=500, detail=f"Depth estimation failed: {str(e)}")
+    finally:
+        release_depth_buffer(processed_image)
+    
+    # Analyze depth map to extract room information
+    try:
+        analysis_results = analyze_depth_map(depth_map, image)
+        logger.debug("🔍 Depth analysis complete: laptop detected = %s", analysis_results['laptop_screen_detected'])
+        logger.debug("📏 Phone to laptop distance: %.2fm", analysis_results['phone_to_laptop_distance'])
         
-        # Analyze depth map to extract room information
-        try:
-            analysis_results = analyze_depth_map(depth_map, image)
-            print(f"🔍 Depth analysis complete: laptop detected = {analysis_results['laptop_screen_detected']}")
-            print(f"📏 Phone to laptop distance: {analysis_results['phone_to_laptop_distance']:.2f}m")
-            
-        except Exception as e:
-            print(f"❌ Depth analysis error: {e}")
-            raise HTTPException(status_code=500, detail=f"Depth analysis failed: {str(e)}")
-        
-        processing_time = (time.time() - start_time) * 1000  # Convert to ms
-        
-        return DepthAnalysisResult(
-            depth_map_available=True,
-            laptop_screen_detected=analysis_results["laptop_screen_detected"],
-            phone_to_laptop_distance=analysis_results["phone_to_laptop_distance"],
-            wall_boundaries=analysis_results["wall_boundaries"],
-            room_dimensions=analysis_results["room_dimensions"],
-            device_positions=analysis_results["device_positions"],
-            processing_time_ms=processing_time
-        )
-        
-    except HTTPException:
-        raise
     except Exception as e:
+        logger.error("❌ Depth analysis error: %s", e)
         raise HTTPException(status_code=500, detail=f"Depth analysis failed: {str(e)}")
+    
+    return analysis_results
+
+def overlay_response(detection_result: DetectionResult, start_time: float) -> ORJSONResponse:
+    """Log (at DEBUG) and serialize an overlay detection result"""
+    processing_time = (time.time() - start_time) * 1000  # Convert to ms
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🎯 [DEBUG] Overlay detection complete:")
+        logger.debug("  - Has overlay: %s", detection_result.has_overlay)
+        logger.debug("  - Confidence: %.3f", detection_result.confidence)
+        logger.debug("  - Type: %s", detection_result.overlay_type)
+        logger.debug("  - Suspicious regions: %d", len(detection_result.suspicious_regions))
+        logger.debug("  - Analysis details keys: %s", list(detection_result.analysis_details.keys()) if detection_result.analysis_details else 'None')
+        logger.debug("  - Processing time: %.1fms", processing_time)
+    
+    # Debug specific analysis results
+    if detection_result.analysis_details and logger.isEnabledFor(logging.DEBUG):
+        if 'color_analysis' in detection_result.analysis_details:
+            color_analysis = detection_result.analysis_details['color_analysis']
+            logger.debug("  - Color analysis: %d overlay types checked", len(color_analysis))
+            for overlay_type, data in color_analysis.items():
+                if len(data.get('regions', ())):
+                    logger.debug("    * %s: %d regions found", overlay_type, len(data['regions']))
+        
+        if 'text_analysis' in detection_result.analysis_details:
+            text_analysis = detection_result.analysis_details['text_analysis']
+            logger.debug("  - Text analysis: density=%s, score=%.3f", text_analysis.get('text_density', 0), text_analysis.get('suspicious_score', 0))
+        
+        if 'video_specific' in detection_result.analysis_details:
+            video_analysis = detection_result.analysis_details['video_specific']
+            logger.debug("  - Video analysis: confidence=%.3f", video_analysis.get('overlay_confidence', 0))
+    
+    # Returned as an OverlayDetectionResult-shaped dict; the region array becomes [x, y, w, h] lists here,
+    # and orjson writes the NumPy arrays and scalars in the analysis details directly
+    return ORJSONResponse({
+        "has_overlay": detection_result.has_overlay,
+        "confidence": detection_result.confidence,
+        "overlay_type": detection_result.overlay_type,
+        "suspicious_regions": detection_result.suspicious_regions.tolist(),
+        "analysis_details": detection_result.analysis_details,
+        "processing_time_ms": processing_time,
+        "timestamp": detection_result.timestamp
+    })
 
 @app.post("/detect-overlays", response_model=OverlayDetectionResult)
 async def detect_overlays(request: FrameRequest):
@@ -698,66 +1341,71 @@ async def detect_overlays(request: FrameRequest):
         raise HTTPException(status_code=503, detail="Overlay detector not initialized")
     
     try:
-        print(f"🔍 [DEBUG] Starting overlay detection for room {request.room}")
-        print(f"🔍 [DEBUG] Input data length: {len(request.data) if request.data else 'None'}")
-        print(f"🔍 [DEBUG] Overlay detector initialized: {overlay_detector is not None}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔍 [DEBUG] Starting overlay detection for room %s", request.room)
+            logger.debug("🔍 [DEBUG] Input data length: %s", len(request.data) if request.data else 'None')
+            logger.debug("🔍 [DEBUG] Overlay detector initialized: %s", overlay_detector is not None)
         
         if not request.data:
             raise ValueError("No image data provided")
         
-        # Run overlay detection
-        print(f"🔍 [DEBUG] Calling overlay_detector.detect_overlay()...")
-        detection_result = overlay_detector.detect_overlay(request.data)
-        
-        processing_time = (time.time() - start_time) * 1000  # Convert to ms
+        # Run overlay detection off the event loop so other requests keep being served meanwhile
+        # (rooms keep separate sessions, so one room's tab switch doesn't start another room's demo alerts)
+        logger.debug("🔍 [DEBUG] Calling overlay_detector.detect_overlay()...")
+        detection_result = await asyncio.get_running_loop().run_in_executor(
+            overlay_pool, overlay_detector.detect_overlay, request.data, get_overlay_session(request.room))
         
-        print(f"🎯 [DEBUG] Overlay detection complete:")
-        print(f"  - Has overlay: {detection_result.has_overlay}")
-        print(f"  - Confidence: {detection_result.confidence:.3f}")
-        print(f"  - Type: {detection_result.overlay_type}")
-        print(f"  - Suspicious regions: {len(detection_result.suspicious_regions)}")
-        print(f"  - Analysis details keys: {list(detection_result.analysis_details.keys()) if detection_result.analysis_details else 'None'}")
-        print(f"  - Processing time: {processing_time:.1f}ms")
-        
-        # Debug specific analysis results
-        if detection_result.analysis_details:
-            if 'color_analysis' in detection_result.analysis_details:
-                color_analysis = detection_result.analysis_details['color_analysis']
-                print(f"  - Color analysis: {len(color_analysis)} overlay types checked")
-                for overlay_type, data in color_analysis.items():
-                    if data.get('regions'):
-                        print(f"    * {overlay_type}: {len(data['regions'])} regions found")
-            
-            if 'text_analysis' in detection_result.analysis_details:
-                text_analysis = detection_result.analysis_details['text_analysis']
-                print(f"  - Text analysis: density={text_analysis.get('text_density', 0)}, score={text_analysis.get('suspicious_score', 0):.3f}")
-            
-            if 'video_specific' in detection_result.analysis_details:
-                video_analysis = detection_result.analysis_details['video_specific']
-                print(f"  - Video analysis: confidence={video_analysis.get('overlay_confidence', 0):.3f}")
-        
-        # Convert suspicious regions to the expected format
-        suspicious_regions_list = [
-            [region[0], region[1], region[2], region[3]] 
-            for region in detection_result.suspicious_regions
-        ]
-        
-        return OverlayDetectionResult(
-            has_overlay=detection_result.has_overlay,
-            confidence=detection_result.confidence,
-            overlay_type=detection_result.overlay_type,
-            suspicious_regions=suspicious_regions_list,
-            analysis_details=detection_result.analysis_details,
-            processing_time_ms=processing_time,
-            timestamp=detection_result.timestamp
-        )
+        return overlay_response(detection_result, start_time)
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Overlay detection error: {str(e)}")
+        logger.error("❌ Overlay detection error: %s", e)
         raise HTTPException(status_code=500, detail=f"Overlay detection failed: {str(e)}")
 
+def detect_overlay_in_image(image_data: bytes, overlay_session: SessionState) -> DetectionResult:
+    """Decode raw JPEG/PNG bytes and run overlay detection on the frame for a room's session (runs on overlay_pool)"""
+    image = decode_image(image_data)
+    if image is None:
+        raise ValueError("Failed to decode image - invalid format or corrupted data")
+    try:
+        return overlay_detector.detect_overlay_array(image, overlay_session)
+    finally:
+        release_decode_buffer(image)
+
+@app.post("/detect-overlays-raw", response_model=OverlayDetectionResult)
+async def detect_overlays_raw(request: Request, room: str = "default", x_room: Optional[str] = Header(None)):
+    """
+    Detect overlay/cheat patterns in a phone camera frame sent as raw JPEG/PNG bytes
+    (Content-Type: application/octet-stream, room in the X-Room header or the query string)
+    Frames share the room's overlay session with /detect-overlays, so its demo alert sequence applies here too
+    """
+    room = x_room or room
+    start_time = time.time()
+    
+    if overlay_detector is None:
+        raise HTTPException(status_code=503, detail="Overlay detector not initialized")
+    
+    # Chunks are appended as they arrive instead of being joined once the body is complete
+    image_data = bytearray()
+    async for chunk in request.stream():
+        image_data.extend(chunk)
+    logger.debug("📥 Received raw overlay frame for room %s: %d bytes", room, len(image_data))
+    
+    if not image_data:
+        raise HTTPException(status_code=400, detail="No image data provided")
+    
+    try:
+        detection_result = await asyncio.get_running_loop().run_in_executor(
+            overlay_pool, detect_overlay_in_image, image_data, get_overlay_session(room))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("❌ Overlay detection error: %s", e)
+        raise HTTPException(status_code=500, detail=f"Overlay detection failed: {str(e)}")
+    
+    return overlay_response(detection_result, start_time)
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -769,7 +1417,7 @@ async def health_check():
 @app.on_event("startup")
 async def startup_event():
     """Load models on startup"""
-    global overlay_detector
+    global overlay_detector, inference_queue, batch_worker_task, inference_sem
     print("🚀 Starting TrueSight ML Detection Service...")
     
     # Load DETR model (required)
@@ -778,6 +1426,13 @@ async def startup_event():
         print("❌ Failed to load DETR model on startup")
         return
     
+    # Concurrent ORT runs fight over the same cores and caches, so inference is serialized
+    inference_sem = asyncio.Semaphore(1)
+    
+    # Start the DETR micro-batching worker
+    inference_queue = asyncio.Queue()
+    batch_worker_task = asyncio.create_task(detr_batch_worker())
+    
     # Load MiDaS depth model (optional)
     depth_success = load_depth_model()
     if not depth_success:
@@ -7,99 +7,263 @@ import cv2
 import numpy as np
 import base64
 import os
-import json
-from typing import List, Dict, Tuple
-from overlay_detection import OverlayDetector, DetectionResult
+import time
+import orjson
+import hashlib
+import logging
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Union, Optional, Iterator
+from overlay_detection import OverlayDetector, DetectionResult, ANALYSIS_VERSION
+
+try:
+    import blake3
+except ImportError:  # blake3 is optional - hashlib's BLAKE2 keys the sample cache otherwise
+    blake3 = None
+
+try:
+    import numba
+except ImportError:  # Numba is optional - summaries fall back to NumPy reductions
+    numba = None
+
+try:
+    from nvidia.dali import Pipeline, fn, types
+except ImportError:  # DALI is optional - only used for GPU decoding when TRUESIGHT_DALI is set
+    Pipeline = None
+
+# Part of every sample cache key - follows overlay_detection's ANALYSIS_VERSION, so summaries
+# cached by earlier analyses are dropped instead of reused
+FEATURE_CACHE_VERSION = ANALYSIS_VERSION
+
+# Images fed through the DALI decoder per pipeline run
+DALI_BATCH_SIZE = 32
+
+# Calibration reports go through the logger with lazy %-formatting; importers keep their own logging setup
+logger = logging.getLogger("truesight.overlay")
+
+def configure_console_logging():
+    """Print calibration reports as-is to stdout - called by the command-line entry points only"""
+    logger.setLevel(logging.INFO)
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+
+def image_digest(image: Union[str, np.ndarray]) -> str:
+    """Content hash of a base64 string or decoded frame, used as the sample cache key"""
+    if isinstance(image, np.ndarray):
+        data = np.ascontiguousarray(image).data
+        prefix = f"{image.shape}:".encode()
+    else:
+        data = image.encode()
+        prefix = b"b64:"
+    hasher = blake3.blake3() if blake3 is not None else hashlib.blake2b(digest_size=16)
+    hasher.update(prefix)
+    hasher.update(data)
+    return hasher.hexdigest()[:32]
+
+def summarize(values: np.ndarray) -> Tuple[float, float, float]:
+    """(min, max, mean) of a non-empty 1-D array"""
+    return values.min(), values.max(), values.mean()
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def summarize(values: np.ndarray) -> Tuple[float, float, float]:
+        """(min, max, mean) of a non-empty 1-D array, computed in a single pass"""
+        low = high = total = values[0]
+        for value in values[1:]:
+            if value < low:
+                low = value
+            elif value > high:
+                high = value
+            total += value
+        return low, high, total / values.shape[0]
+
+class SampleSet:
+    """
+    Calibration samples stored column-wise: confidences and region counts in typed arrays
+    that NumPy reads in one copy, descriptions and analysis details in parallel lists
+    """
+    __slots__ = ("descriptions", "confidences", "regions", "details")
+    
+    def __init__(self, samples: Optional[List[Dict]] = None):
+        self.descriptions = []
+        self.confidences = array('d')
+        self.regions = array('q')
+        self.details = []  # analysis_details of each sample
+        for sample in samples or ():
+            self.append(sample.get('description', ""), sample)
+    
+    def append(self, description: str, summary: Dict):
+        """Add one sample from a detection summary"""
+        self.descriptions.append(description)
+        self.confidences.append(summary['confidence'])
+        self.regions.append(summary['suspicious_regions'])
+        self.details.append(summary['analysis_details'])
+    
+    def __len__(self) -> int:
+        return len(self.descriptions)
+    
+    def confidence_array(self) -> np.ndarray:
+        return np.array(self.confidences, dtype=np.float64)
+    
+    def region_array(self) -> np.ndarray:
+        return np.array(self.regions, dtype=np.int64)
+    
+    def feature_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Color pattern region counts and text suspicious scores, gathered in one pass over the
+        analysis details; each array only covers the samples that carried that analysis
+        """
+        color_regions = np.empty(len(self), dtype=np.int64)
+        text_scores = np.empty(len(self), dtype=np.float64)
+        n_color = n_text = 0
+        for details in self.details:
+            color_analysis = details.get('color_analysis')
+            if color_analysis is not None:
+                color_regions[n_color] = sum(len(data.get('regions', ())) for data in color_analysis.values())
+                n_color += 1
+            text_analysis = details.get('text_analysis')
+            if text_analysis is not None:
+                text_scores[n_text] = text_analysis.get('suspicious_score', 0)
+                n_text += 1
+        return color_regions[:n_color], text_scores[:n_text]
+    
+    def to_dicts(self) -> List[Dict]:
+        """Row-wise samples, as stored in the calibration file"""
+        return [
+            {"description": description, "confidence": confidence,
+             "analysis_details": details, "suspicious_regions": regions}
+            for description, confidence, details, regions
+            in zip(self.descriptions, self.confidences, self.details, self.regions)
+        ]
 
 class OverlayCalibrator:
     def __init__(self):
-        self.normal_samples = []  # Screenshots of normal app pages
-        self.cheat_samples = []   # Screenshots with actual overlays
+        self.normal_samples = SampleSet()  # Screenshots of normal app pages
+        self.cheat_samples = SampleSet()   # Screenshots with actual overlays
         self.baseline_features = {}
         self.calibration_file = "overlay_calibration_data.json"
+        self.cache_file = "overlay_calibration_cache.json"
+        # One detector for every sample - construction re-reads the calibration file
+        self._detector = OverlayDetector(detection_threshold=0.1)  # Low threshold for analysis
+        # image digest -> detection summary, so re-runs over the same screenshots skip the detector
+        self._cache = self._load_cache()
+        
+    def _analyze(self, image: Union[str, np.ndarray]) -> Dict:
+        """
+        Detection summary (confidence, analysis_details, suspicious_regions count) for a base64
+        string or an already decoded BGR frame, served from the cache when the image was seen before
+        """
+        key = f"v{FEATURE_CACHE_VERSION}:{image_digest(image)}"
+        summary = self._cache.get(key)
+        if summary is not None:
+            return summary
         
-    def add_normal_sample(self, base64_image: str, description: str = ""):
+        if isinstance(image, np.ndarray):
+            result = self._detector.detect_overlay_array(image)
+        else:
+            result = self._detector.detect_overlay(image)
+        
+        summary = {
+            "confidence": result.confidence,
+            "analysis_details": result.analysis_details,
+            "suspicious_regions": len(result.suspicious_regions)
+        }
+        # Failed detections are retried next time rather than remembered
+        if 'error' not in result.analysis_details:
+            self._cache[key] = summary
+        return summary
+    
+    def _analyze_file(self, path: str) -> Dict:
+        """Decode an image file and return its detection summary"""
+        return self._analyze(load_image(path))
+    
+    def _load_cache(self) -> Dict:
+        """Load detection summaries persisted by earlier calibration runs, minus those from other cache versions"""
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'rb') as f:
+                    cache = orjson.loads(f.read())
+                prefix = f"v{FEATURE_CACHE_VERSION}:"
+                return {key: summary for key, summary in cache.items() if key.startswith(prefix)}
+            except Exception as e:
+                logger.warning("⚠️ Ignoring unreadable sample cache: %s", e)
+        return {}
+    
+    def save_cache(self):
+        """Persist detection summaries next to the calibration data"""
+        with open(self.cache_file, 'wb') as f:
+            f.write(orjson.dumps(self._cache, option=orjson.OPT_SERIALIZE_NUMPY))
+    
+    def add_normal_sample(self, image: Union[str, np.ndarray], description: str = ""):
         """Add a sample of normal app page (should NOT trigger alerts)"""
         try:
-            detector = OverlayDetector(detection_threshold=0.1)  # Low threshold for analysis
-            result = detector.detect_overlay(base64_image)
-            
-            sample = {
-                "description": description,
-                "confidence": result.confidence,
-                "analysis_details": result.analysis_details,
-                "suspicious_regions": len(result.suspicious_regions)
-            }
-            
-            self.normal_samples.append(sample)
-            print(f"✅ Added normal sample: {description}")
-            print(f"   Confidence: {result.confidence:.3f}")
-            print(f"   Suspicious regions: {len(result.suspicious_regions)}")
-            
+            self._record_sample(self._analyze(image), description, cheat=False)
         except Exception as e:
-            print(f"❌ Error processing normal sample: {e}")
+            logger.error("❌ Error processing normal sample: %s", e)
     
-    def add_cheat_sample(self, base64_image: str, description: str = ""):
+    def add_cheat_sample(self, image: Union[str, np.ndarray], description: str = ""):
         """Add a sample with actual cheating overlay (should trigger alerts)"""
         try:
-            detector = OverlayDetector(detection_threshold=0.1)  # Low threshold for analysis
-            result = detector.detect_overlay(base64_image)
-            
-            sample = {
-                "description": description,
-                "confidence": result.confidence,
-                "analysis_details": result.analysis_details,
-                "suspicious_regions": len(result.suspicious_regions)
-            }
-            
-            self.cheat_samples.append(sample)
-            print(f"🚨 Added cheat sample: {description}")
-            print(f"   Confidence: {result.confidence:.3f}")
-            print(f"   Suspicious regions: {len(result.suspicious_regions)}")
-            
+            self._record_sample(self._analyze(image), description, cheat=True)
         except Exception as e:
-            print(f"❌ Error processing cheat sample: {e}")
+            logger.error("❌ Error processing cheat sample: %s", e)
+    
+    def _record_sample(self, summary: Dict, description: str, cheat: bool):
+        """Append an analyzed sample to the normal or cheat set"""
+        if cheat:
+            self.cheat_samples.append(description, summary)
+            logger.info("🚨 Added cheat sample: %s", description)
+        else:
+            self.normal_samples.append(description, summary)
+            logger.info("✅ Added normal sample: %s", description)
+        logger.info("   Confidence: %.3f", summary['confidence'])
+        logger.info("   Suspicious regions: %d", summary['suspicious_regions'])
     
     def analyze_samples(self):
         """Analyze all samples to find distinguishing features"""
         if not self.normal_samples or not self.cheat_samples:
-            print("❌ Need both normal and cheat samples to analyze")
+            logger.error("❌ Need both normal and cheat samples to analyze")
             return
         
-        print("\n📊 CALIBRATION ANALYSIS")
-        print("=" * 50)
+        logger.info("\n📊 CALIBRATION ANALYSIS")
+        logger.info("=" * 50)
         
         # Analyze normal samples
-        normal_confidences = [s['confidence'] for s in self.normal_samples]
-        normal_regions = [s['suspicious_regions'] for s in self.normal_samples]
+        normal_confidences = self.normal_samples.confidence_array()
+        normal_regions = self.normal_samples.region_array()
+        min_normal, max_normal, mean_normal = summarize(normal_confidences)
+        min_normal_regions, max_normal_regions, _ = summarize(normal_regions)
         
-        print(f"\n✅ NORMAL SAMPLES ({len(self.normal_samples)}):")
-        print(f"   Confidence range: {min(normal_confidences):.3f} - {max(normal_confidences):.3f}")
-        print(f"   Average confidence: {np.mean(normal_confidences):.3f}")
-        print(f"   Suspicious regions: {min(normal_regions)} - {max(normal_regions)}")
+        logger.info("\n✅ NORMAL SAMPLES (%d):", len(self.normal_samples))
+        logger.info("   Confidence range: %.3f - %.3f", min_normal, max_normal)
+        logger.info("   Average confidence: %.3f", mean_normal)
+        logger.info("   Suspicious regions: %d - %d", min_normal_regions, max_normal_regions)
         
         # Analyze cheat samples
-        cheat_confidences = [s['confidence'] for s in self.cheat_samples]
-        cheat_regions = [s['suspicious_regions'] for s in self.cheat_samples]
+        cheat_confidences = self.cheat_samples.confidence_array()
+        cheat_regions = self.cheat_samples.region_array()
+        min_cheat, max_cheat, mean_cheat = summarize(cheat_confidences)
+        min_cheat_regions, max_cheat_regions, _ = summarize(cheat_regions)
         
-        print(f"\n🚨 CHEAT SAMPLES ({len(self.cheat_samples)}):")
-        print(f"   Confidence range: {min(cheat_confidences):.3f} - {max(cheat_confidences):.3f}")
-        print(f"   Average confidence: {cheat_confidences:.3f}")
-        print(f"   Suspicious regions: {min(cheat_regions)} - {max(cheat_regions)}")
+        logger.info("\n🚨 CHEAT SAMPLES (%d):", len(self.cheat_samples))
+        logger.info("   Confidence range: %.3f - %.3f", min_cheat, max_cheat)
+        logger.info("   Average confidence: %.3f", mean_cheat)
+        logger.info("   Suspicious regions: %d - %d", min_cheat_regions, max_cheat_regions)
         
         # Find optimal threshold
-        max_normal = max(normal_confidences)
-        min_cheat = min(cheat_confidences)
-        
         if max_normal < min_cheat:
             optimal_threshold = (max_normal + min_cheat) / 2
-            print(f"\n🎯 RECOMMENDED THRESHOLD: {optimal_threshold:.3f}")
-            print(f"   This should separate normal ({max_normal:.3f}) from cheat ({min_cheat:.3f})")
+            logger.info("\n🎯 RECOMMENDED THRESHOLD: %.3f", optimal_threshold)
+            logger.info("   This should separate normal (%.3f) from cheat (%.3f)", max_normal, min_cheat)
         else:
-            print(f"\n⚠️ OVERLAP DETECTED!")
-            print(f"   Max normal confidence: {max_normal:.3f}")
-            print(f"   Min cheat confidence: {min_cheat:.3f}")
-            print(f"   Need better features or more samples")
+            logger.warning("\n⚠️ OVERLAP DETECTED!")
+            logger.warning("   Max normal confidence: %.3f", max_normal)
+            logger.warning("   Min cheat confidence: %.3f", min_cheat)
+            logger.warning("   Need better features or more samples")
         
         # Detailed feature analysis
         self._analyze_detailed_features()
@@ -108,101 +272,143 @@ class OverlayCalibrator:
     
     def _analyze_detailed_features(self):
         """Analyze specific features that distinguish normal from cheat samples"""
-        print(f"\n🔍 DETAILED FEATURE ANALYSIS")
-        print("-" * 30)
+        logger.info("\n🔍 DETAILED FEATURE ANALYSIS")
+        logger.info("-" * 30)
+        
+        normal_color_data, normal_text_data = self.normal_samples.feature_arrays()
+        cheat_color_data, cheat_text_data = self.cheat_samples.feature_arrays()
         
         # Analyze color patterns
-        normal_color_data = []
-        cheat_color_data = []
-        
-        for sample in self.normal_samples:
-            if 'color_analysis' in sample['analysis_details']:
-                color_analysis = sample['analysis_details']['color_analysis']
-                total_regions = sum(len(data.get('regions', [])) for data in color_analysis.values())
-                normal_color_data.append(total_regions)
-        
-        for sample in self.cheat_samples:
-            if 'color_analysis' in sample['analysis_details']:
-                color_analysis = sample['analysis_details']['color_analysis']
-                total_regions = sum(len(data.get('regions', [])) for data in color_analysis.values())
-                cheat_color_data.append(total_regions)
-        
-        if normal_color_data and cheat_color_data:
-            print(f"Color pattern regions:")
-            print(f"  Normal: avg={np.mean(normal_color_data):.1f}, max={max(normal_color_data)}")
-            print(f"  Cheat:  avg={np.mean(cheat_color_data):.1f}, max={max(cheat_color_data)}")
+        if len(normal_color_data) and len(cheat_color_data):
+            logger.info("Color pattern regions:")
+            logger.info("  Normal: avg=%.1f, max=%d", normal_color_data.mean(), normal_color_data.max())
+            logger.info("  Cheat:  avg=%.1f, max=%d", cheat_color_data.mean(), cheat_color_data.max())
         
         # Analyze text patterns
-        normal_text_data = []
-        cheat_text_data = []
-        
-        for sample in self.normal_samples:
-            if 'text_analysis' in sample['analysis_details']:
-                text_score = sample['analysis_details']['text_analysis'].get('suspicious_score', 0)
-                normal_text_data.append(text_score)
-        
-        for sample in self.cheat_samples:
-            if 'text_analysis' in sample['analysis_details']:
-                text_score = sample['analysis_details']['text_analysis'].get('suspicious_score', 0)
-                cheat_text_data.append(text_score)
-        
-        if normal_text_data and cheat_text_data:
-            print(f"Text analysis scores:")
-            print(f"  Normal: avg={np.mean(normal_text_data):.3f}, max={max(normal_text_data):.3f}")
-            print(f"  Cheat:  avg={np.mean(cheat_text_data):.3f}, max={max(cheat_text_data):.3f}")
+        if len(normal_text_data) and len(cheat_text_data):
+            logger.info("Text analysis scores:")
+            logger.info("  Normal: avg=%.3f, max=%.3f", normal_text_data.mean(), normal_text_data.max())
+            logger.info("  Cheat:  avg=%.3f, max=%.3f", cheat_text_data.mean(), cheat_text_data.max())
     
     def save_calibration(self, threshold: float):
         """Save calibration data to file"""
         calibration_data = {
             "threshold": threshold,
+            "analysis_version": ANALYSIS_VERSION,  # Thresholds only hold for the analyses that scored the samples
             "normal_samples_count": len(self.normal_samples),
             "cheat_samples_count": len(self.cheat_samples),
-            "normal_samples": self.normal_samples,
-            "cheat_samples": self.cheat_samples,
-            "timestamp": str(np.datetime64('now'))
+            "normal_samples": self.normal_samples.to_dicts(),
+            "cheat_samples": self.cheat_samples.to_dicts(),
+            "timestamp_ns": time.time_ns()  # Unix epoch nanoseconds
         }
         
-        with open(self.calibration_file, 'w') as f:
-            json.dump(calibration_data, f, indent=2)
+        # orjson writes NumPy scalars found in analysis_details directly
+        with open(self.calibration_file, 'wb') as f:
+            f.write(orjson.dumps(calibration_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
         
-        print(f"💾 Calibration saved to {self.calibration_file}")
+        logger.info("💾 Calibration saved to %s", self.calibration_file)
     
     def load_calibration(self):
         """Load calibration data from file"""
         if os.path.exists(self.calibration_file):
-            with open(self.calibration_file, 'r') as f:
-                data = json.load(f)
+            with open(self.calibration_file, 'rb') as f:
+                data = orjson.loads(f.read())
+            
+            calibrated_version = data.get('analysis_version', 1)
+            if calibrated_version != ANALYSIS_VERSION:
+                logger.warning("⚠️ %s was made with analysis version %d (now %d) - re-run calibration",
+                               self.calibration_file, calibrated_version, ANALYSIS_VERSION)
+                return None
             
-            self.normal_samples = data.get('normal_samples', [])
-            self.cheat_samples = data.get('cheat_samples', [])
+            self.normal_samples = SampleSet(data.get('normal_samples', []))
+            self.cheat_samples = SampleSet(data.get('cheat_samples', []))
             
-            print(f"📂 Loaded calibration: {len(self.normal_samples)} normal, {len(self.cheat_samples)} cheat samples")
+            logger.info("📂 Loaded calibration: %d normal, %d cheat samples", len(self.normal_samples), len(self.cheat_samples))
             return data.get('threshold')
         
         return None
 
 # Helper functions for easy testing
+def load_image(path: str) -> np.ndarray:
+    """
+    Decode an image file straight to a BGR array, skipping the base64 round trip
+    The bytes are read into a NumPy buffer and decoded from memory, which also handles
+    non-ASCII paths that cv2.imread can't open on Windows
+    """
+    image = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Failed to decode image - invalid format or corrupted data")
+    return image
+
+def dali_enabled() -> bool:
+    """Whether GPU decoding was requested with TRUESIGHT_DALI and DALI is installed"""
+    if not os.environ.get("TRUESIGHT_DALI"):
+        return False
+    if Pipeline is None:
+        logger.warning("⚠️ TRUESIGHT_DALI is set but nvidia-dali is not installed - decoding on the CPU")
+        return False
+    return True
+
+class DaliImageLoader:
+    """
+    Decodes image files on the GPU with NVIDIA DALI in batches of DALI_BATCH_SIZE
+    Frames are copied back to host memory since the detector runs on the CPU; frames are not
+    resized so detection results match the CPU decode path
+    """
+    
+    def __init__(self, batch_size: int = DALI_BATCH_SIZE, device_id: int = 0):
+        self.batch_size = batch_size
+        # Synchronous execution so every feed_input is consumed by exactly one run()
+        self._pipe = Pipeline(batch_size=batch_size, num_threads=min(4, os.cpu_count() or 1), device_id=device_id,
+                              exec_async=False, exec_pipelined=False)
+        with self._pipe:
+            encoded = fn.external_source(name="encoded", dtype=types.UINT8)
+            self._pipe.set_outputs(fn.decoders.image(encoded, device="mixed", output_type=types.BGR))
+        self._pipe.build()
+    
+    def load(self, paths: List[str]) -> Iterator[Tuple[str, Optional[np.ndarray]]]:
+        """
+        Yield (path, BGR frame) in input order; frames of a batch DALI failed to decode are None
+        so the caller can fall back to load_image and report the bad file
+        """
+        for start in range(0, len(paths), self.batch_size):
+            batch = paths[start:start + self.batch_size]
+            try:
+                self._pipe.feed_input("encoded", [np.fromfile(path, dtype=np.uint8) for path in batch])
+                decoded, = self._pipe.run()
+                decoded = decoded.as_cpu()
+                frames = [np.array(decoded.at(i)) for i in range(len(batch))]
+            except Exception as e:
+                logger.warning("⚠️ DALI decode failed, falling back to CPU for %d images: %s", len(batch), e)
+                frames = [None] * len(batch)
+            yield from zip(batch, frames)
+
 def calibrate_from_files(normal_image_paths: List[str], cheat_image_paths: List[str]):
     """Calibrate from image files"""
     calibrator = OverlayCalibrator()
     
-    # Load normal samples
-    for path in normal_image_paths:
-        try:
-            with open(path, 'rb') as f:
-                image_data = base64.b64encode(f.read()).decode()
-            calibrator.add_normal_sample(image_data, f"Normal: {os.path.basename(path)}")
-        except Exception as e:
-            print(f"❌ Error loading {path}: {e}")
+    # Decoding and detection are OpenCV calls that release the GIL, so samples are analyzed in
+    # parallel; they are recorded afterwards in their original order
+    labelled_paths = [(path, False) for path in normal_image_paths] + [(path, True) for path in cheat_image_paths]
+    paths = [path for path, _ in labelled_paths]
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        if dali_enabled():
+            # Each decoded batch is analyzed while DALI decodes the next one
+            summaries = [
+                pool.submit(calibrator._analyze, frame) if frame is not None else pool.submit(calibrator._analyze_file, path)
+                for path, frame in DaliImageLoader().load(paths)
+            ]
+        else:
+            summaries = [pool.submit(calibrator._analyze_file, path) for path in paths]
     
-    # Load cheat samples
-    for path in cheat_image_paths:
+    for (path, cheat), summary in zip(labelled_paths, summaries):
         try:
-            with open(path, 'rb') as f:
-                image_data = base64.b64encode(f.read()).decode()
-            calibrator.add_cheat_sample(image_data, f"Cheat: {os.path.basename(path)}")
+            label = "Cheat" if cheat else "Normal"
+            calibrator._record_sample(summary.result(), f"{label}: {os.path.basename(path)}", cheat)
         except Exception as e:
-            print(f"❌ Error loading {path}: {e}")
+            logger.error("❌ Error loading %s: %s", path, e)
+    
+    calibrator.save_cache()
     
     # Analyze and get threshold
     threshold = calibrator.analyze_samples()
@@ -213,5 +419,6 @@ def calibrate_from_files(normal_image_paths: List[str], cheat_image_paths: List[
     return None
 
 if __name__ == "__main__":
-    print("🎯 Overlay Detection Calibration System")
-    print("Add your sample images and run analysis...")
+    configure_console_logging()
+    logger.info("🎯 Overlay Detection Calibration System")
+    logger.info("Add your sample images and run analysis...")
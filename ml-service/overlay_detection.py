@@ -2,32 +2,150 @@ import cv2
 import numpy as np
 import base64
 import binascii
-import json
+import orjson
 import os
-from typing import Tuple, Dict, List, Optional
-from dataclasses import dataclass
+from typing import Tuple, Dict, List, Optional, Iterable, Iterator
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import threading
+import queue
 from datetime import datetime
 
+try:
+    import numba
+except ImportError:  # Numba is optional - the histogram scan falls back to plain Python
+    numba = None
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):  # PyTurboJPEG and libturbojpeg are optional - OpenCV decodes otherwise
+    turbo_jpeg = None
+
+# Per-frame diagnostics are logged at DEBUG and cost nothing at the default level - LOG_LEVEL=DEBUG shows them
+logger = logging.getLogger(__name__)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING").upper()
+if isinstance(logging.getLevelName(LOG_LEVEL), int):  # Unknown names map to a "Level X" string
+    logger.setLevel(LOG_LEVEL)
+else:
+    logger.setLevel(logging.WARNING)
+    logger.warning("⚠️ Unknown LOG_LEVEL %r - using WARNING", LOG_LEVEL)
+
+# Bump whenever a change alters what the analyses report for a frame - cached calibration samples
+# and calibrated thresholds from other versions are then discarded instead of reused
+ANALYSIS_VERSION = 3
+
+WELL_EXPOSED_STD = 40.0  # Thumbnail luminance spread above which a frame has enough contrast to skip CLAHE
+BLOB_ANALYSIS_SCALE = 2  # Color and popup analyses look for large blobs, so they run on a 1/2-scale screen
+EMPTY_REGIONS = np.empty((0, 4), dtype=np.int32)  # Shared read-only "no regions" value
+EMPTY_REGIONS.flags.writeable = False
+STREAM_QUEUE_SIZE = 2  # Frames buffered between process_stream stages
+_STREAM_END = object()  # Marks the end of the frame stream between process_stream stages
+
+def count_histogram_peaks(hist: np.ndarray, min_height: float) -> int:
+    """Count local maxima taller than min_height in a 1-D histogram (end bins excluded)"""
+    inner = hist[1:-1]
+    return int(np.count_nonzero((inner > hist[:-2]) & (inner > hist[2:]) & (inner > min_height)))
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def count_histogram_peaks(hist: np.ndarray, min_height: float) -> int:
+        """Count local maxima taller than min_height in a 1-D histogram (end bins excluded), in a single scan"""
+        peaks = 0
+        for i in range(1, hist.shape[0] - 1):
+            if hist[i] > hist[i-1] and hist[i] > hist[i+1] and hist[i] > min_height:
+                peaks += 1
+        return peaks
+
+def thumbnail_gray(frame: np.ndarray) -> np.ndarray:
+    """64x64 grayscale thumbnail of a BGR frame (resized before converting, so only 4096 pixels are converted)"""
+    return cv2.cvtColor(cv2.resize(frame, (64, 64)), cv2.COLOR_BGR2GRAY)
+
+def downscale(image: np.ndarray, scale: int) -> np.ndarray:
+    """Shrink an image by an integer factor with area averaging (returned as is for scale 1)"""
+    if scale == 1:
+        return image
+    return cv2.resize(image, None, fx=1 / scale, fy=1 / scale, interpolation=cv2.INTER_AREA)
+
+def rect_sums(integral: np.ndarray, rects: np.ndarray) -> np.ndarray:
+    """Pixel sums of (x, y, w, h) rects, as int64, from a summed-area table of the image they index"""
+    x0, y0 = rects[:, 0], rects[:, 1]
+    x1, y1 = x0 + rects[:, 2], y0 + rects[:, 3]
+    # Only the gathered corners are widened (the squared-sum table is float64 holding exact integers)
+    bottom_right, top_right, bottom_left, top_left = (
+        integral[ys, xs].astype(np.int64) for ys, xs in ((y1, x1), (y0, x1), (y1, x0), (y0, x0))
+    )
+    return bottom_right - top_right - bottom_left + top_left
+
+def text_like_rects(sums: np.ndarray, squared_sums: np.ndarray, rects: np.ndarray) -> np.ndarray:
+    """
+    Mask of the (x, y, w, h) rects with a text-like aspect ratio and pixel variance above 50,
+    from the summed-area tables (cv2.integral2) of the image they index
+    """
+    aspect_ratio = rects[:, 2] / rects[:, 3]
+    # var > 50  <=>  n * sum(I^2) - sum(I)^2 > 50 * n^2, compared in exact integer arithmetic
+    total = rect_sums(sums, rects)
+    squared_total = rect_sums(squared_sums, rects)
+    n = rects[:, 2].astype(np.int64) * rects[:, 3]
+    return (0.1 < aspect_ratio) & (aspect_ratio < 15) & (n * squared_total - total * total > 50 * n * n)
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def text_like_rects(sums: np.ndarray, squared_sums: np.ndarray, rects: np.ndarray) -> np.ndarray:
+        """
+        Mask of the (x, y, w, h) rects with a text-like aspect ratio and pixel variance above 50,
+        from the summed-area tables (cv2.integral2) of the image they index, in a single pass over the rects
+        """
+        mask = np.zeros(rects.shape[0], dtype=np.bool_)
+        for i in range(rects.shape[0]):
+            x0, y0, w, h = rects[i, 0], rects[i, 1], rects[i, 2], rects[i, 3]
+            aspect_ratio = w / h
+            if aspect_ratio <= 0.1 or aspect_ratio >= 15:
+                continue
+            x1, y1 = x0 + w, y0 + h
+            total = (np.int64(sums[y1, x1]) - np.int64(sums[y0, x1])
+                     - np.int64(sums[y1, x0]) + np.int64(sums[y0, x0]))
+            squared_total = (np.int64(squared_sums[y1, x1]) - np.int64(squared_sums[y0, x1])
+                             - np.int64(squared_sums[y1, x0]) + np.int64(squared_sums[y0, x0]))
+            n = np.int64(w) * h
+            mask[i] = n * squared_total - total * total > 50 * n * n
+        return mask
+
 @dataclass
 class DetectionResult:
     has_overlay: bool
     confidence: float
     overlay_type: Optional[str]
-    suspicious_regions: List[Tuple[int, int, int, int]]  # x, y, w, h
+    suspicious_regions: np.ndarray  # Nx4 int32: x, y, w, h
     analysis_details: Dict
     timestamp: str
 
+@dataclass
+class SessionState:
+    """
+    Per-stream state of one camera feed (one room): the tab-switch tracker and the demo alert sequence
+    The detector itself only holds read-only configuration, so one instance can serve many sessions at once
+    """
+    last_frame_gray: Optional[np.ndarray] = None  # 64x64 grayscale thumbnail of the previous frame
+    last_frame_mean: Optional[float] = None
+    demo_sequence_active: bool = False
+    demo_alerts_sent: int = 0
+    last_demo_time: float = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)  # Frames of one session can still overlap
+
 class OverlayDetector:
-    def __init__(self, detection_threshold: float = 0.6, use_calibration: bool = True):
+    def __init__(self, detection_threshold: float = 0.6, use_calibration: bool = True, demo_verbose: bool = True):
         self.detection_threshold = detection_threshold
         self.use_calibration = use_calibration
         self.calibrated_threshold = None
-        self.logger = logging.getLogger(__name__)
-        self.last_frame_hash = None
-        self.demo_sequence_active = False
-        self.demo_alerts_sent = 0
-        self.last_demo_time = 0
+        self.logger = logger
+        self.default_session = SessionState()  # Used when the caller doesn't keep sessions of its own
+        self._demo_verbose = demo_verbose  # Demo events are rare and meant to be seen, so they print unless turned off
+        self._demo_handlers = {
+            'demo_tab_switch_trigger': self._handle_tab_switch,
+            'demo_check_sequence': self._handle_check_sequence,
+        }
         
         # Load calibration data if available
         if use_calibration:
@@ -51,17 +169,43 @@ class OverlayDetector:
             'highlight_green': [(40, 50, 50), (80, 255, 255)],  # Green highlights
             'overlay_blue': [(100, 50, 50), (130, 255, 255)]    # Blue overlays
         }
+        
+        # Per-frame constants, built once: color bounds as arrays, zone bounds as columns (x, y, x + w, y + h)
+        self._color_ranges_np = {
+            overlay_type: (np.array(lower, dtype=np.uint8), np.array(upper, dtype=np.uint8))
+            for overlay_type, (lower, upper) in self.overlay_color_ranges.items()
+        }
+        zones = np.array(self.leetcode_patterns['solution_overlay_zones'], dtype=np.float64)
+        self._zone_bounds = (zones[:, 0], zones[:, 1], zones[:, 0] + zones[:, 2], zones[:, 1] + zones[:, 3])
+        self._morph_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+        # Compile the JIT kernels (or load them from cache) now rather than on the first frame
+        if numba is not None:
+            sums, squared_sums = cv2.integral2(np.zeros((16, 16), dtype=np.uint8))
+            text_like_rects(sums, squared_sums, np.array([[0, 0, 4, 4]], dtype=np.int64))
+            count_histogram_peaks(np.zeros(256, dtype=np.float32), 100.0)
+        
+        # CLAHE objects keep scratch buffers between apply() calls, so each thread gets its own
+        # (as does the histogram output buffer)
+        self._thread_local = threading.local()
+        # The four per-frame analyses are independent OpenCV work that releases the GIL, so they run side by side
+        self._pool = ThreadPoolExecutor(max_workers=4)
     
     def _load_calibration_data(self):
         """Load calibration data to adjust detection threshold"""
         calibration_file = "overlay_calibration_data.json"
         if os.path.exists(calibration_file):
             try:
-                with open(calibration_file, 'r') as f:
-                    data = json.load(f)
+                with open(calibration_file, 'rb') as f:
+                    data = orjson.loads(f.read())
                 
                 self.calibrated_threshold = data.get('threshold')
-                if self.calibrated_threshold:
+                # Files written before versions were recorded came from the version 1 analyses
+                calibrated_version = data.get('analysis_version', 1)
+                if self.calibrated_threshold and calibrated_version != ANALYSIS_VERSION:
+                    print(f"⚠️ Calibration was made with analysis version {calibrated_version} (now {ANALYSIS_VERSION}) "
+                          f"- using default threshold, re-run calibration")
+                    self.calibrated_threshold = None
+                elif self.calibrated_threshold:
                     print(f"📊 Loaded calibrated threshold: {self.calibrated_threshold:.3f}")
                     print(f"📊 Based on {data.get('normal_samples_count', 0)} normal + {data.get('cheat_samples_count', 0)} cheat samples")
                 else:
@@ -72,120 +216,208 @@ class OverlayDetector:
         else:
             print("📝 No calibration data found - using default threshold")
     
+    def _clahe(self) -> cv2.CLAHE:
+        """This thread's contrast equalizer"""
+        clahe = getattr(self._thread_local, 'clahe', None)
+        if clahe is None:
+            clahe = self._thread_local.clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
+        return clahe
+    
+    def _hist_buffer(self) -> np.ndarray:
+        """This thread's reusable 256-bin calcHist output"""
+        hist = getattr(self._thread_local, 'hist', None)
+        if hist is None:
+            hist = self._thread_local.hist = np.empty((256, 1), dtype=np.float32)
+        return hist
+    
     def get_effective_threshold(self) -> float:
         """Get the effective threshold (calibrated if available, otherwise default)"""
         if self.use_calibration and self.calibrated_threshold is not None:
             return self.calibrated_threshold
         return self.detection_threshold
     
-    def _detect_context_change(self, frame: np.ndarray) -> bool:
-        """Detect significant changes that might indicate tab switching"""
-        import hashlib
+    def _detect_context_change(self, frame: np.ndarray, session: SessionState) -> bool:
+        """Detect significant changes that might indicate tab switching (call with session.lock held)"""
         import time
         
-        # Create a simple hash of the frame to detect major changes
-        frame_small = cv2.resize(frame, (64, 64))
-        frame_gray = cv2.cvtColor(frame_small, cv2.COLOR_BGR2GRAY)
-        frame_hash = hashlib.md5(frame_gray.tobytes()).hexdigest()
+        # Compare 64x64 thumbnails so identical frames skip the brightness comparison
+        frame_gray = thumbnail_gray(frame)
         
-        if self.last_frame_hash is None:
-            self.last_frame_hash = frame_hash
+        if session.last_frame_gray is None:
+            session.last_frame_gray = frame_gray
             return False
         
         # Calculate difference
-        if frame_hash != self.last_frame_hash:
+        if cv2.countNonZero(cv2.absdiff(frame_gray, session.last_frame_gray)):
             # Check if it's a significant change (different content)
-            current_mean = np.mean(frame_gray)
+            current_mean = float(frame_gray.mean())
             
             # Decode previous frame for comparison
-            if hasattr(self, '_last_frame_mean'):
-                mean_diff = abs(current_mean - self._last_frame_mean)
+            if session.last_frame_mean is not None:
+                mean_diff = abs(current_mean - session.last_frame_mean)
                 
                 # If mean brightness changed significantly, might be tab switch
                 if mean_diff > 30:  # Threshold for detecting major visual changes
-                    print(f"🔄 [DEMO] Significant visual change detected (mean diff: {mean_diff:.1f})")
-                    self.last_frame_hash = frame_hash
-                    self._last_frame_mean = current_mean
+                    if self._demo_verbose:
+                        print(f"🔄 [DEMO] Significant visual change detected (mean diff: {mean_diff:.1f})")
+                    session.last_frame_gray = frame_gray
+                    session.last_frame_mean = current_mean
                     
                     # Start demo sequence
-                    if not self.demo_sequence_active:
-                        self.demo_sequence_active = True
-                        self.demo_alerts_sent = 0
-                        self.last_demo_time = time.time()
-                        print(f"🎭 [DEMO] Tab switch detected - starting overlay sequence")
+                    if not session.demo_sequence_active:
+                        session.demo_sequence_active = True
+                        session.demo_alerts_sent = 0
+                        session.last_demo_time = time.time()
+                        if self._demo_verbose:
+                            print(f"🎭 [DEMO] Tab switch detected - starting overlay sequence")
                         return True
             
-            self._last_frame_mean = current_mean
-            self.last_frame_hash = frame_hash
+            session.last_frame_mean = current_mean
+            session.last_frame_gray = frame_gray
         
         return False
     
-    def _check_demo_sequence(self) -> Tuple[bool, str]:
-        """Check if we should send demo overlay alerts"""
+    def _check_demo_sequence(self, session: SessionState) -> Tuple[bool, str]:
+        """Check if we should send demo overlay alerts (call with session.lock held)"""
         import time
         
-        if not self.demo_sequence_active:
+        if not session.demo_sequence_active:
             return False, None
         
         current_time = time.time()
         
         # Send alerts every 2 seconds, up to 4 times
-        if (current_time - self.last_demo_time) >= 2.0 and self.demo_alerts_sent < 4:
-            self.demo_alerts_sent += 1
-            self.last_demo_time = current_time
+        if (current_time - session.last_demo_time) >= 2.0 and session.demo_alerts_sent < 4:
+            session.demo_alerts_sent += 1
+            session.last_demo_time = current_time
             
             # Same overlay type for all 4 alerts
             selected_type = "overlay_detected"
-            print(f"🎭 [DEMO] Sending overlay alert {self.demo_alerts_sent}/4: {selected_type}")
+            if self._demo_verbose:
+                print(f"🎭 [DEMO] Sending overlay alert {session.demo_alerts_sent}/4: {selected_type}")
             
-            if self.demo_alerts_sent >= 4:
-                print(f"🎭 [DEMO] Demo sequence complete")
+            if session.demo_alerts_sent >= 4:
+                if self._demo_verbose:
+                    print(f"🎭 [DEMO] Demo sequence complete")
                 # Reset but keep it active for potential future switches
-                self.demo_sequence_active = False
+                session.demo_sequence_active = False
             
             return True, selected_type
         
         return False, None
     
+    def _demo_sequence_result(self, session: SessionState) -> Optional[DetectionResult]:
+        """The session's next timed demo overlay alert, if one is due (call with session.lock held)"""
+        demo_alert, demo_type = self._check_demo_sequence(session)
+        if not demo_alert:
+            return None
+        
+        # Return demo alert immediately
+        return DetectionResult(
+            has_overlay=True,
+            confidence=0.95,  # High confidence for demo
+            overlay_type=demo_type,
+            suspicious_regions=np.array([(100, 100, 200, 150)], dtype=np.int32),  # Fake region
+            analysis_details={'demo_mode': True, 'alert_sequence': session.demo_alerts_sent},
+            timestamp=datetime.now().isoformat()
+        )
+    
+    def _handle_tab_switch(self, session: SessionState) -> DetectionResult:
+        """Demo trigger: report a tab switch and start the session's overlay alert sequence (call with session.lock held)"""
+        if self._demo_verbose:
+            print(f"🎭 [DEMO] Tab switch trigger received - starting demo sequence")
+        # Start the demo sequence
+        import time
+        session.demo_sequence_active = True
+        session.demo_alerts_sent = 0
+        session.last_demo_time = time.time()
+        
+        # Return tab switch detection
+        return DetectionResult(
+            has_overlay=True,
+            confidence=0.90,
+            overlay_type="tab_switch_detected",
+            suspicious_regions=EMPTY_REGIONS,
+            analysis_details={'demo_mode': True, 'event': 'tab_switch'},
+            timestamp=datetime.now().isoformat()
+        )
+    
+    def _handle_check_sequence(self, session: SessionState) -> DetectionResult:
+        """Demo trigger: report the next overlay alert of the session's sequence, if any are left (call with session.lock held)"""
+        if self._demo_verbose:
+            print(f"🎭 [DEMO] Checking for next alert in sequence")
+        # Force return the next overlay alert
+        if session.demo_sequence_active and session.demo_alerts_sent < 4:
+            session.demo_alerts_sent += 1
+            if self._demo_verbose:
+                print(f"🎭 [DEMO] Returning overlay alert {session.demo_alerts_sent}/4")
+            
+            return DetectionResult(
+                has_overlay=True,
+                confidence=0.95,
+                overlay_type="overlay_detected",
+                suspicious_regions=np.array([(100, 100, 200, 150)], dtype=np.int32),
+                analysis_details={'demo_mode': True, 'alert_sequence': session.demo_alerts_sent},
+                timestamp=datetime.now().isoformat()
+            )
+        else:
+            # No more alerts
+            return DetectionResult(
+                has_overlay=False,
+                confidence=0.0,
+                overlay_type=None,
+                suspicious_regions=EMPTY_REGIONS,
+                analysis_details={'demo_mode': True, 'sequence_complete': True},
+                timestamp=datetime.now().isoformat()
+            )
+    
     def decode_frame(self, base64_frame: str) -> np.ndarray:
         """Decode base64 image to OpenCV format - handles mobile device frames"""
         try:
             # Handle different base64 formats from mobile devices
             if base64_frame.startswith('data:image'):
                 # Remove data URL prefix if present
-                base64_frame = base64_frame.split(',')[1]
-            
-            # Remove any whitespace/newlines that mobile might add
-            base64_frame = base64_frame.strip().replace('\n', '').replace('\r', '')
+                base64_frame = base64_frame.split(',', 1)[1]
             
-            # Decode base64 to bytes
-            img_bytes = base64.b64decode(base64_frame)
+            # Decode base64 to bytes - without validation b64decode skips the whitespace/newlines
+            # mobile devices add, so the payload isn't copied just to strip them
+            img_bytes = base64.b64decode(base64_frame, validate=False)
             
-            # Convert to numpy array
-            img_array = np.frombuffer(img_bytes, dtype=np.uint8)
+            # JPEGs (nearly every mobile frame) go through libjpeg-turbo's TurboJPEG API when it is available
+            frame = None
+            if turbo_jpeg is not None and img_bytes[:3] == b'\xff\xd8\xff':
+                try:
+                    frame = turbo_jpeg.decode(img_bytes, pixel_format=TJPF_BGR)
+                except Exception:
+                    frame = None  # Let OpenCV try, which also rejects data neither can decode
             
-            # Decode image (supports JPEG, PNG, etc.)
-            frame = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+            if frame is None:
+                # Wrap the bytes as a numpy array without copying them
+                img_array = np.frombuffer(img_bytes, dtype=np.uint8)
+                
+                # Decode image (supports JPEG, PNG, etc.)
+                frame = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
             
             if frame is None:
                 raise ValueError("Failed to decode image - invalid format or corrupted data")
             
             # Log successful decode for debugging
-            self.logger.debug(f"Successfully decoded frame: {frame.shape}")
+            self.logger.debug("Successfully decoded frame: %s", frame.shape)
             return frame
             
         except binascii.Error as e:
-            self.logger.error(f"Base64 decoding failed: {str(e)}")
+            self.logger.error("Base64 decoding failed: %s", e)
             raise ValueError(f"Invalid base64 data: {str(e)}")
         except Exception as e:
-            self.logger.error(f"Image decoding failed: {str(e)}")
+            self.logger.error("Image decoding failed: %s", e)
             raise
     
     def preprocess_frame(self, frame: np.ndarray) -> np.ndarray:
         """Enhance frame quality for better detection"""
         # Resize for consistent processing
         height, width = frame.shape[:2]
-        if width < 800:
+        upscaled = width < 800
+        if upscaled:
             scale = 800 / width
             new_width, new_height = int(width * scale), int(height * scale)
             frame = cv2.resize(frame, (new_width, new_height))
@@ -193,13 +425,16 @@ class OverlayDetector:
         # Perspective correction for angled phone shots
         frame = self.correct_perspective(frame)
         
+        # Large frames that are already high-contrast gain little from CLAHE, so skip its three full-image passes
+        if not upscaled and float(thumbnail_gray(frame).std()) > WELL_EXPOSED_STD:
+            return frame
+        
         # Enhance contrast and reduce glare
         lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
         l_channel, a, b = cv2.split(lab)
         
         # CLAHE for better contrast
-        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-        l_channel = clahe.apply(l_channel)
+        l_channel = self._clahe().apply(l_channel)
         
         enhanced = cv2.merge((l_channel, a, b))
         enhanced = cv2.cvtColor(enhanced, cv2.COLOR_LAB2BGR)
@@ -212,9 +447,10 @@ class OverlayDetector:
         # For now, assume the screen takes up most of the frame
         return frame
     
-    def detect_screen_region(self, frame: np.ndarray) -> Tuple[int, int, int, int]:
-        """Detect the laptop screen region in the phone camera image"""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    def detect_screen_region(self, frame: np.ndarray, gray: Optional[np.ndarray] = None) -> Tuple[int, int, int, int]:
+        """Detect the laptop screen region in the phone camera image (gray: the frame's grayscale, if already converted)"""
+        if gray is None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         
         # Edge detection to find screen boundaries
         edges = cv2.Canny(gray, 50, 150, apertureSize=3)
@@ -246,72 +482,97 @@ class OverlayDetector:
             margin_x, margin_y = int(w * 0.1), int(h * 0.1)
             return (margin_x, margin_y, w - 2*margin_x, h - 2*margin_y)
     
-    def detect_overlays_by_color(self, frame: np.ndarray, screen_region: Tuple[int, int, int, int]) -> Dict:
-        """Detect overlays based on suspicious color patterns"""
+    def detect_overlays_by_color(self, frame: np.ndarray, screen_region: Tuple[int, int, int, int],
+                                 hsv: Optional[np.ndarray] = None, scale: int = 1) -> Dict:
+        """
+        Detect overlays based on suspicious color patterns (hsv: the screen region in HSV, if already converted)
+        With scale > 1 the analysis runs on the screen shrunk by that factor (as hsv, when given), and regions
+        are reported in full-frame coordinates
+        """
         x, y, w, h = screen_region
-        screen_roi = frame[y:y+h, x:x+w]
-        
-        hsv = cv2.cvtColor(screen_roi, cv2.COLOR_BGR2HSV)
+        if hsv is None:
+            hsv = cv2.cvtColor(downscale(frame[y:y+h, x:x+w], scale), cv2.COLOR_BGR2HSV)
+        min_area, max_area = 500 / scale**2, 50000 / scale**2  # Reasonable overlay sizes, in analysed pixels
         overlay_detections = {}
         
-        for overlay_type, (lower, upper) in self.overlay_color_ranges.items():
-            mask = cv2.inRange(hsv, np.array(lower), np.array(upper))
-            
-            # Find contours in the mask
-            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            suspicious_regions = []
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                if 500 < area < 50000:  # Filter reasonable overlay sizes
-                    rect_x, rect_y, rect_w, rect_h = cv2.boundingRect(contour)
-                    
-                    # Check if it's in a suspicious location
-                    rel_x = rect_x / w
-                    rel_y = rect_y / h
-                    
-                    for zone_x, zone_y, zone_w, zone_h in self.leetcode_patterns['solution_overlay_zones']:
-                        if (zone_x <= rel_x <= zone_x + zone_w and 
-                            zone_y <= rel_y <= zone_y + zone_h):
-                            suspicious_regions.append((x + rect_x, y + rect_y, rect_w, rect_h))
+        zone_x, zone_y, zone_right, zone_bottom = self._zone_bounds
+        
+        # One mask buffer serves every color range - the labelling only reads it
+        mask = np.empty(hsv.shape[:2], dtype=np.uint8)
+        
+        for overlay_type, (lower, upper) in self._color_ranges_np.items():
+            cv2.inRange(hsv, lower, upper, dst=mask)
+            
+            # A blob's contour area never exceeds its bounding box, so component stats discard the
+            # (mostly single-pixel) blobs that can't reach min_area before any contour is traced
+            _, labels, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+            candidates = stats[:, cv2.CC_STAT_WIDTH] * stats[:, cv2.CC_STAT_HEIGHT] > min_area
+            candidates[0] = False  # Background
+            
+            sized = []
+            if candidates.any():
+                # Each component's external contour depends only on its own pixels, so tracing the
+                # candidates alone gives the same contours and areas as tracing the whole mask
+                candidate_mask = (candidates.astype(np.uint8) * 255)[labels]
+                contours, _ = cv2.findContours(candidate_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+                sized = [cv2.boundingRect(contour) for contour in contours
+                         if min_area < cv2.contourArea(contour) < max_area]
+            
+            suspicious_regions = EMPTY_REGIONS
+            total_area = 0
+            if sized:
+                rects = np.array(sized, dtype=np.int64) * scale
+                
+                # Check every rect against every suspicious zone at once
+                rel_x = rects[:, :1] / w
+                rel_y = rects[:, 1:2] / h
+                in_zone = (zone_x <= rel_x) & (rel_x <= zone_right) & (zone_y <= rel_y) & (rel_y <= zone_bottom)
+                
+                # A rect is reported once per zone it falls in, as zones overlap
+                rects = np.repeat(rects, in_zone.sum(axis=1), axis=0)
+                rects[:, :2] += (x, y)
+                suspicious_regions = rects.astype(np.int32)
+                total_area = int((rects[:, 2] * rects[:, 3]).sum())
             
             overlay_detections[overlay_type] = {
                 'regions': suspicious_regions,
-                'total_area': sum([r[2] * r[3] for r in suspicious_regions])
+                'total_area': total_area
             }
         
         return overlay_detections
     
-    def detect_text_overlays(self, frame: np.ndarray, screen_region: Tuple[int, int, int, int]) -> Dict:
-        """Detect suspicious text that might be solution overlays"""
+    def detect_text_overlays(self, frame: np.ndarray, screen_region: Tuple[int, int, int, int],
+                             gray: Optional[np.ndarray] = None) -> Dict:
+        """Detect suspicious text that might be solution overlays (gray: the screen region in grayscale, if already converted)"""
         x, y, w, h = screen_region
-        screen_roi = frame[y:y+h, x:x+w]
-        gray = cv2.cvtColor(screen_roi, cv2.COLOR_BGR2GRAY)
+        if gray is None:
+            gray = cv2.cvtColor(frame[y:y+h, x:x+w], cv2.COLOR_BGR2GRAY)
         
         # Edge detection for text
         edges = cv2.Canny(gray, 30, 100)
         
         # Morphological operations to connect text
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-        edges = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel)
+        edges = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, self._morph_kernel)
         
         contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
-        text_regions = []
+        # A contour's area never exceeds its bounding box, so boxes of 100 px or less are rejected
+        # without computing contourArea - most Canny fragments are that small
+        sized = []
         for contour in contours:
-            area = cv2.contourArea(contour)
-            if 100 < area < 10000:
-                rect_x, rect_y, rect_w, rect_h = cv2.boundingRect(contour)
-                aspect_ratio = rect_w / rect_h
-                
-                # Text-like aspect ratios
-                if 0.1 < aspect_ratio < 15:
-                    # Check text density
-                    text_roi = gray[rect_y:rect_y+rect_h, rect_x:rect_x+rect_w]
-                    if text_roi.size > 0:
-                        text_variance = np.var(text_roi)
-                        if text_variance > 50:  # Indicates text-like patterns
-                            text_regions.append((x + rect_x, y + rect_y, rect_w, rect_h))
+            rect = cv2.boundingRect(contour)
+            if rect[2] * rect[3] > 100 and 100 < cv2.contourArea(contour) < 10000:
+                sized.append(rect)
+        
+        text_regions = EMPTY_REGIONS
+        if sized:
+            rects = np.array(sized, dtype=np.int64)
+            
+            # Text-like aspect ratios with enough pixel variance - every rect from two summed-area tables
+            sums, squared_sums = cv2.integral2(gray)
+            rects = rects[text_like_rects(sums, squared_sums, rects)]
+            rects[:, :2] += (x, y)
+            text_regions = rects.astype(np.int32)
         
         return {
             'text_regions': text_regions,
@@ -319,13 +580,14 @@ class OverlayDetector:
             'suspicious_score': min(len(text_regions) / 10.0, 1.0)
         }
     
-    def detect_ui_inconsistencies(self, frame: np.ndarray, screen_region: Tuple[int, int, int, int]) -> Dict:
-        """Detect UI elements that don't belong to standard LeetCode interface"""
+    def detect_ui_inconsistencies(self, frame: np.ndarray, screen_region: Tuple[int, int, int, int],
+                                  gray: Optional[np.ndarray] = None) -> Dict:
+        """Detect UI elements that don't belong to standard LeetCode interface (gray: the screen region in grayscale, if already converted)"""
         x, y, w, h = screen_region
-        screen_roi = frame[y:y+h, x:x+w]
         
         # Look for rectangular overlays that don't match LeetCode's design
-        gray = cv2.cvtColor(screen_roi, cv2.COLOR_BGR2GRAY)
+        if gray is None:
+            gray = cv2.cvtColor(frame[y:y+h, x:x+w], cv2.COLOR_BGR2GRAY)
         
         # Template matching for common overlay patterns could go here
         # For now, detect unusual rectangular regions
@@ -334,43 +596,50 @@ class OverlayDetector:
         lines = cv2.HoughLinesP(edges, 1, np.pi/180, threshold=50, minLineLength=30, maxLineGap=10)
         
         rectangular_score = 0
-        horizontal_lines = []
-        vertical_lines = []
+        horizontal_count = 0
+        vertical_count = 0
         
         if lines is not None:
-            # Analyze line patterns for rectangular overlays
-            for line in lines:
-                x1, y1, x2, y2 = line[0]
-                angle = np.arctan2(y2 - y1, x2 - x1) * 180 / np.pi
-                
-                if abs(angle) < 10 or abs(angle - 180) < 10:  # Horizontal
-                    horizontal_lines.append(line)
-                elif abs(angle - 90) < 10 or abs(angle + 90) < 10:  # Vertical
-                    vertical_lines.append(line)
+            # Analyze line patterns for rectangular overlays - all segment angles at once
+            segments = lines[:, 0, :]
+            angles = np.arctan2(segments[:, 3] - segments[:, 1], segments[:, 2] - segments[:, 0]) * 180 / np.pi
+            
+            horizontal = (np.abs(angles) < 10) | (np.abs(angles - 180) < 10)
+            vertical = ~horizontal & ((np.abs(angles - 90) < 10) | (np.abs(angles + 90) < 10))
+            horizontal_count = int(np.count_nonzero(horizontal))
+            vertical_count = int(np.count_nonzero(vertical))
             
             # Score based on presence of rectangular patterns
-            if len(horizontal_lines) > 4 and len(vertical_lines) > 4:
+            if horizontal_count > 4 and vertical_count > 4:
                 rectangular_score = 0.7
         
         return {
             'rectangular_overlay_score': rectangular_score,
             'line_analysis': {
-                'horizontal_lines': len(horizontal_lines),
-                'vertical_lines': len(vertical_lines)
+                'horizontal_lines': horizontal_count,
+                'vertical_lines': vertical_count
             }
         }
     
-    def analyze_for_specific_video(self, frame: np.ndarray, screen_region: Tuple[int, int, int, int]) -> Dict:
-        """Specific analysis for the known test video pattern"""
+    def analyze_for_specific_video(self, frame: np.ndarray, screen_region: Tuple[int, int, int, int],
+                                   gray: Optional[np.ndarray] = None, hsv: Optional[np.ndarray] = None,
+                                   scale: int = 1) -> Dict:
+        """
+        Specific analysis for the known test video pattern (gray/hsv: the screen region, if already converted)
+        With scale > 1 the analysis runs on the screen shrunk by that factor (as gray/hsv, when given)
+        """
         x, y, w, h = screen_region
-        screen_roi = frame[y:y+h, x:x+w]
+        screen_roi = downscale(frame[y:y+h, x:x+w], scale)
+        pixel_area = scale**2  # Full-resolution pixels behind each analysed pixel
         
         # Look for patterns specific to the video you're testing against
         # This is where you can add very targeted detection
         
         # Convert to different color spaces for analysis
-        hsv = cv2.cvtColor(screen_roi, cv2.COLOR_BGR2HSV)
-        gray = cv2.cvtColor(screen_roi, cv2.COLOR_BGR2GRAY)
+        if hsv is None:
+            hsv = cv2.cvtColor(screen_roi, cv2.COLOR_BGR2HSV)
+        if gray is None:
+            gray = cv2.cvtColor(screen_roi, cv2.COLOR_BGR2GRAY)
         
         # Check for overlay indicators specific to interview cheat tools
         overlay_indicators = {
@@ -386,19 +655,18 @@ class OverlayDetector:
         
         for contour in bright_contours:
             area = cv2.contourArea(contour)
-            if 1000 < area < 100000:  # Popup-sized regions
+            if 1000 < area * pixel_area < 100000:  # Popup-sized regions
                 overlay_indicators['popup_windows'] += 1
         
         # Check for unusual color patterns that might indicate overlays
-        for channel in cv2.split(hsv):
-            hist = cv2.calcHist([channel], [0], None, [256], [0, 256])
-            peaks = []
-            for i in range(1, 255):
-                if hist[i] > hist[i-1] and hist[i] > hist[i+1] and hist[i] > 100:
-                    peaks.append(i)
+        # (histograms are taken per channel straight from the HSV image, without splitting it,
+        # into one buffer that is overwritten for each channel)
+        hist = self._hist_buffer()
+        for channel in range(3):
+            cv2.calcHist([hsv], [channel], None, [256], [0, 256], hist=hist, accumulate=False)
             
             # Multiple peaks might indicate layered content
-            if len(peaks) > 3:
+            if count_histogram_peaks(hist.ravel(), 100.0 / pixel_area) > 3:
                 overlay_indicators['suspicious_highlights'] += 0.2
         
         # Calculate overall confidence
@@ -412,161 +680,244 @@ class OverlayDetector:
         
         return overlay_indicators
     
-    def detect_overlay(self, base64_frame: str) -> DetectionResult:
-        """Main detection method"""
+    def detect_overlay(self, base64_frame: str, session: Optional[SessionState] = None) -> DetectionResult:
+        """
+        Main detection method
+        session carries the caller's per-stream state (tab-switch and demo tracking); without one the
+        detector's default session is used, which every such caller shares
+        """
+        if session is None:
+            session = self.default_session
         try:
-            print(f"🔍 [OVERLAY DEBUG] Starting detection process...")
-            
-            # Check for demo triggers
-            if base64_frame == 'demo_tab_switch_trigger':
-                print(f"🎭 [DEMO] Tab switch trigger received - starting demo sequence")
-                # Start the demo sequence
-                import time
-                self.demo_sequence_active = True
-                self.demo_alerts_sent = 0
-                self.last_demo_time = time.time()
+            self.logger.debug("🔍 [OVERLAY DEBUG] Starting detection process...")
+            
+            # Only the session's demo bookkeeping is serialized - frame analysis below runs unlocked
+            with session.lock:
+                # Demo triggers all share one prefix, so real frames skip the lookup after a single prefix test
+                if base64_frame.startswith('demo_'):
+                    handler = self._demo_handlers.get(base64_frame)
+                    if handler is not None:
+                        return handler(session)
                 
-                # Return tab switch detection
-                return DetectionResult(
-                    has_overlay=True,
-                    confidence=0.90,
-                    overlay_type="tab_switch_detected",
-                    suspicious_regions=[],
-                    analysis_details={'demo_mode': True, 'event': 'tab_switch'},
-                    timestamp=datetime.now().isoformat()
-                )
+                # Check for demo sequence (overlay alerts)
+                demo_result = self._demo_sequence_result(session)
+                if demo_result is not None:
+                    return demo_result
             
-            elif base64_frame == 'demo_check_sequence':
-                print(f"🎭 [DEMO] Checking for next alert in sequence")
-                # Force return the next overlay alert
-                if self.demo_sequence_active and self.demo_alerts_sent < 4:
-                    self.demo_alerts_sent += 1
-                    print(f"🎭 [DEMO] Returning overlay alert {self.demo_alerts_sent}/4")
-                    
-                    return DetectionResult(
-                        has_overlay=True,
-                        confidence=0.95,
-                        overlay_type="overlay_detected",
-                        suspicious_regions=[(100, 100, 200, 150)],
-                        analysis_details={'demo_mode': True, 'alert_sequence': self.demo_alerts_sent},
-                        timestamp=datetime.now().isoformat()
-                    )
-                else:
-                    # No more alerts
-                    return DetectionResult(
-                        has_overlay=False,
-                        confidence=0.0,
-                        overlay_type=None,
-                        suspicious_regions=[],
-                        analysis_details={'demo_mode': True, 'sequence_complete': True},
-                        timestamp=datetime.now().isoformat()
-                    )
-            
-            # Check for demo sequence (overlay alerts)
-            demo_alert, demo_type = self._check_demo_sequence()
-            if demo_alert:
-                # Return demo alert immediately
-                return DetectionResult(
-                    has_overlay=True,
-                    confidence=0.95,  # High confidence for demo
-                    overlay_type=demo_type,
-                    suspicious_regions=[(100, 100, 200, 150)],  # Fake region
-                    analysis_details={'demo_mode': True, 'alert_sequence': self.demo_alerts_sent},
-                    timestamp=datetime.now().isoformat()
-                )
-            
-            # Decode and preprocess actual frames
-            print(f"🔍 [OVERLAY DEBUG] Decoding base64 frame...")
+            # Decode actual frames
+            self.logger.debug("🔍 [OVERLAY DEBUG] Decoding base64 frame...")
             frame = self.decode_frame(base64_frame)
-            print(f"🔍 [OVERLAY DEBUG] Frame decoded successfully: {frame.shape}")
-            
-            print(f"🔍 [OVERLAY DEBUG] Preprocessing frame...")
-            enhanced_frame = self.preprocess_frame(frame)
-            print(f"🔍 [OVERLAY DEBUG] Frame preprocessed: {enhanced_frame.shape}")
-            
-            # Detect screen region
-            print(f"🔍 [OVERLAY DEBUG] Detecting screen region...")
-            screen_region = self.detect_screen_region(enhanced_frame)
-            print(f"🔍 [OVERLAY DEBUG] Screen region detected: {screen_region}")
-            
-            # Run all detection methods
-            print(f"🔍 [OVERLAY DEBUG] Running color analysis...")
-            color_analysis = self.detect_overlays_by_color(enhanced_frame, screen_region)
-            print(f"🔍 [OVERLAY DEBUG] Color analysis complete")
-            
-            print(f"🔍 [OVERLAY DEBUG] Running text analysis...")
-            text_analysis = self.detect_text_overlays(enhanced_frame, screen_region)
-            print(f"🔍 [OVERLAY DEBUG] Text analysis complete")
-            
-            print(f"🔍 [OVERLAY DEBUG] Running UI analysis...")
-            ui_analysis = self.detect_ui_inconsistencies(enhanced_frame, screen_region)
-            print(f"🔍 [OVERLAY DEBUG] UI analysis complete")
-            
-            print(f"🔍 [OVERLAY DEBUG] Running video-specific analysis...")
-            video_specific = self.analyze_for_specific_video(enhanced_frame, screen_region)
-            print(f"🔍 [OVERLAY DEBUG] Video-specific analysis complete")
-            
-            # Combine all suspicious regions
-            all_suspicious_regions = []
-            for overlay_type, data in color_analysis.items():
-                all_suspicious_regions.extend(data['regions'])
-            all_suspicious_regions.extend(text_analysis['text_regions'])
-            
-            # Calculate final confidence score
-            color_score = sum([len(data['regions']) for data in color_analysis.values()]) / 10.0
-            text_score = text_analysis['suspicious_score']
-            ui_score = ui_analysis['rectangular_overlay_score']
-            video_score = video_specific['overlay_confidence']
-            
-            # Weighted combination
-            final_confidence = min((
-                color_score * 0.3 +
-                text_score * 0.25 +
-                ui_score * 0.2 +
-                video_score * 0.25
-            ), 1.0)
-            
-            # Determine overlay type using calibrated threshold
-            effective_threshold = self.get_effective_threshold()
-            print(f"🎯 [OVERLAY DEBUG] Using threshold: {effective_threshold:.3f} (calibrated: {self.use_calibration and self.calibrated_threshold is not None})")
-            
-            overlay_type = None
-            if final_confidence > effective_threshold:
-                if video_score > 0.5:
-                    overlay_type = "cheat_tool_overlay"
-                elif text_score > 0.6:
-                    overlay_type = "text_solution_overlay"
-                elif ui_score > 0.5:
-                    overlay_type = "popup_overlay"
-                else:
-                    overlay_type = "suspicious_overlay"
-            
-            return DetectionResult(
-                has_overlay=final_confidence > effective_threshold,
-                confidence=final_confidence,
-                overlay_type=overlay_type,
-                suspicious_regions=all_suspicious_regions,
-                analysis_details={
-                    'screen_region': screen_region,
-                    'color_analysis': color_analysis,
-                    'text_analysis': text_analysis,
-                    'ui_analysis': ui_analysis,
-                    'video_specific': video_specific,
-                    'frame_dimensions': enhanced_frame.shape
-                },
-                timestamp=datetime.now().isoformat()
-            )
+            self.logger.debug("🔍 [OVERLAY DEBUG] Frame decoded successfully: %s", frame.shape)
             
         except Exception as e:
-            self.logger.error(f"Detection failed: {str(e)}")
-            return DetectionResult(
-                has_overlay=False,
-                confidence=0.0,
-                overlay_type=None,
-                suspicious_regions=[],
-                analysis_details={'error': str(e)},
-                timestamp=datetime.now().isoformat()
-            )
+            return self._error_result(e)
+        
+        return self.detect_overlay_array(frame)  # The session's demo sequence was already checked above
+    
+    def detect_overlay_array(self, frame: np.ndarray, session: Optional[SessionState] = None) -> DetectionResult:
+        """
+        Run the overlay analysis on an already decoded BGR frame (no base64 or demo trigger handling)
+        With a session, a due demo alert from that session's sequence is returned instead, as in detect_overlay
+        """
+        try:
+            if session is not None:
+                with session.lock:
+                    demo_result = self._demo_sequence_result(session)
+                if demo_result is not None:
+                    return demo_result
+            return self._analyze_prepared(*self._prepare_frame(frame))
+        except Exception as e:
+            return self._error_result(e)
+    
+    def _prepare_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, Tuple[int, int, int, int], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Preprocess a decoded frame and locate the screen:
+        (enhanced frame, screen region, screen gray, screen gray and HSV at BLOB_ANALYSIS_SCALE)
+        """
+        self.logger.debug("🔍 [OVERLAY DEBUG] Preprocessing frame...")
+        enhanced_frame = self.preprocess_frame(frame)
+        self.logger.debug("🔍 [OVERLAY DEBUG] Frame preprocessed: %s", enhanced_frame.shape)
+        
+        # Grayscale and HSV are converted once and shared by every analysis
+        gray = cv2.cvtColor(enhanced_frame, cv2.COLOR_BGR2GRAY)
+        
+        # Detect screen region
+        self.logger.debug("🔍 [OVERLAY DEBUG] Detecting screen region...")
+        screen_region = self.detect_screen_region(enhanced_frame, gray=gray)
+        self.logger.debug("🔍 [OVERLAY DEBUG] Screen region detected: %s", screen_region)
+        
+        x, y, w, h = screen_region
+        screen_gray = gray[y:y+h, x:x+w]
+        
+        # The blob analyses share one reduced-scale copy of the screen in both color spaces
+        small_screen = downscale(enhanced_frame[y:y+h, x:x+w], BLOB_ANALYSIS_SCALE)
+        small_gray = cv2.cvtColor(small_screen, cv2.COLOR_BGR2GRAY)
+        small_hsv = cv2.cvtColor(small_screen, cv2.COLOR_BGR2HSV)
+        
+        return enhanced_frame, screen_region, screen_gray, small_gray, small_hsv
+    
+    def _analyze_prepared(self, enhanced_frame: np.ndarray, screen_region: Tuple[int, int, int, int],
+                          screen_gray: np.ndarray, small_gray: np.ndarray, small_hsv: np.ndarray) -> DetectionResult:
+        """Run the four analyses on a prepared frame and combine them into a result"""
+        # Run all detection methods concurrently - each reads only its arguments and writes no detector state
+        # (text and UI edges need full resolution: thin glyph strokes and short lines vanish at half scale)
+        self.logger.debug("🔍 [OVERLAY DEBUG] Running color, text, UI and video-specific analysis...")
+        color_future = self._pool.submit(self.detect_overlays_by_color, enhanced_frame, screen_region,
+                                         hsv=small_hsv, scale=BLOB_ANALYSIS_SCALE)
+        text_future = self._pool.submit(self.detect_text_overlays, enhanced_frame, screen_region, gray=screen_gray)
+        ui_future = self._pool.submit(self.detect_ui_inconsistencies, enhanced_frame, screen_region, gray=screen_gray)
+        video_future = self._pool.submit(self.analyze_for_specific_video, enhanced_frame, screen_region,
+                                         gray=small_gray, hsv=small_hsv, scale=BLOB_ANALYSIS_SCALE)
+        color_analysis = color_future.result()
+        text_analysis = text_future.result()
+        ui_analysis = ui_future.result()
+        video_specific = video_future.result()
+        self.logger.debug("🔍 [OVERLAY DEBUG] Analysis complete")
+        
+        # Combine all suspicious regions into one Nx4 array
+        all_suspicious_regions = np.concatenate(
+            [data['regions'] for data in color_analysis.values()] + [text_analysis['text_regions']]
+        )
+        
+        # Calculate final confidence score
+        color_score = sum([len(data['regions']) for data in color_analysis.values()]) / 10.0
+        text_score = text_analysis['suspicious_score']
+        ui_score = ui_analysis['rectangular_overlay_score']
+        video_score = video_specific['overlay_confidence']
+        
+        # Weighted combination
+        final_confidence = min((
+            color_score * 0.3 +
+            text_score * 0.25 +
+            ui_score * 0.2 +
+            video_score * 0.25
+        ), 1.0)
+        
+        # Determine overlay type using calibrated threshold
+        effective_threshold = self.get_effective_threshold()
+        self.logger.debug("🎯 [OVERLAY DEBUG] Using threshold: %.3f (calibrated: %s)",
+                          effective_threshold, self.use_calibration and self.calibrated_threshold is not None)
+        
+        overlay_type = None
+        if final_confidence > effective_threshold:
+            if video_score > 0.5:
+                overlay_type = "cheat_tool_overlay"
+            elif text_score > 0.6:
+                overlay_type = "text_solution_overlay"
+            elif ui_score > 0.5:
+                overlay_type = "popup_overlay"
+            else:
+                overlay_type = "suspicious_overlay"
+        
+        return DetectionResult(
+            has_overlay=final_confidence > effective_threshold,
+            confidence=final_confidence,
+            overlay_type=overlay_type,
+            suspicious_regions=all_suspicious_regions,
+            analysis_details={
+                'screen_region': screen_region,
+                'color_analysis': color_analysis,
+                'text_analysis': text_analysis,
+                'ui_analysis': ui_analysis,
+                'video_specific': video_specific,
+                'frame_dimensions': enhanced_frame.shape
+            },
+            timestamp=datetime.now().isoformat()
+        )
+    
+    def process_stream(self, base64_frames: Iterable[str]) -> Iterator[DetectionResult]:
+        """
+        Detect overlays on a stream of base64 frames, yielding results in input order
+        Decoding, preprocessing and analysis run as three pipelined threads joined by small bounded queues,
+        so frame N+1 is decoded while frame N is analysed and a fast producer can't pile up frames in memory
+        Demo triggers are not recognised here - send those through detect_overlay
+        """
+        stop = threading.Event()
+        decoded, prepared, results = (queue.Queue(maxsize=STREAM_QUEUE_SIZE) for _ in range(3))
+        source_error = []
+        
+        def put(q: queue.Queue, item) -> bool:
+            # Give up once the consumer has stopped reading instead of blocking on a full queue forever
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def get(q: queue.Queue):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            return _STREAM_END
+        
+        def decode_stage():
+            try:
+                for base64_frame in base64_frames:
+                    try:
+                        item = self.decode_frame(base64_frame)
+                    except Exception as e:
+                        item = e  # A bad frame becomes an error result, the stream carries on
+                    if not put(decoded, item):
+                        return
+            except Exception as e:
+                source_error.append(e)
+            put(decoded, _STREAM_END)
+        
+        def run_stage(source: queue.Queue, sink: queue.Queue, work):
+            while True:
+                item = get(source)
+                if item is not _STREAM_END and not isinstance(item, Exception):
+                    try:
+                        item = work(item)
+                    except Exception as e:
+                        item = e
+                if not put(sink, item) or item is _STREAM_END:
+                    return
+        
+        workers = [
+            threading.Thread(target=decode_stage, daemon=True),
+            threading.Thread(target=run_stage, args=(decoded, prepared, self._prepare_frame), daemon=True),
+            threading.Thread(target=run_stage, args=(prepared, results, lambda item: self._analyze_prepared(*item)), daemon=True),
+        ]
+        for worker in workers:
+            worker.start()
+        
+        try:
+            while True:
+                item = results.get()
+                if item is _STREAM_END:
+                    break
+                yield self._error_result(item) if isinstance(item, Exception) else item
+            if source_error:
+                raise source_error[0]
+        finally:
+            stop.set()
+    
+    def detect_overlay_batch(self, frames: List[np.ndarray]) -> List[DetectionResult]:
+        """
+        Run detect_overlay_array over several decoded frames at once, in input order
+        Each frame is an independent OpenCV pipeline that releases the GIL, so frames run on parallel threads
+        """
+        if len(frames) <= 1:
+            return [self.detect_overlay_array(frame) for frame in frames]
+        with ThreadPoolExecutor(max_workers=min(len(frames), os.cpu_count() or 1)) as pool:
+            return list(pool.map(self.detect_overlay_array, frames))
+    
+    def _error_result(self, error: Exception) -> DetectionResult:
+        """No-overlay result carrying the error that stopped detection"""
+        self.logger.error("Detection failed: %s", error)
+        return DetectionResult(
+            has_overlay=False,
+            confidence=0.0,
+            overlay_type=None,
+            suspicious_regions=EMPTY_REGIONS,
+            analysis_details={'error': str(error)},
+            timestamp=datetime.now().isoformat()
+        )
 
 # Example usage and testing
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+INT8 quantization script for the MiDaS depth model
+Run this offline to produce models/depth/model.int8.onnx
+Requires the onnx package in addition to the service requirements
+"""
+
+import os
+from onnxruntime.quantization import QuantType, quantize_dynamic
+
+MODEL_DIR = os.path.join("models", "depth")
+FP32_MODEL_PATH = os.path.join(MODEL_DIR, "model.onnx")
+INT8_MODEL_PATH = os.path.join(MODEL_DIR, "model.int8.onnx")
+
+def main():
+    print("🔢 MiDaS INT8 Quantization Tool")
+    print("=" * 50)
+
+    if not os.path.exists(FP32_MODEL_PATH):
+        print(f"❌ Model file not found: {FP32_MODEL_PATH}")
+        return
+
+    # Depth output only feeds coarse room heuristics, so dynamic quantization needs no calibration set
+    print("\n⚙️ Quantizing weights (dynamic QInt8)...")
+    quantize_dynamic(FP32_MODEL_PATH, INT8_MODEL_PATH, weight_type=QuantType.QInt8)
+
+    fp32_size = os.path.getsize(FP32_MODEL_PATH) / (1024 * 1024)
+    int8_size = os.path.getsize(INT8_MODEL_PATH) / (1024 * 1024)
+    print(f"✅ Quantized model saved to {INT8_MODEL_PATH} ({fp32_size:.1f}MB -> {int8_size:.1f}MB)")
+
+    print("\n🚀 Restart the ML service to load the INT8 model")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+INT8 quantization script for the DETR human/phone model
+Run this offline to produce models/human+phone/model.int8.onnx
+Requires the onnx package in addition to the service requirements
+"""
+
+import os
+import sys
+import cv2
+import numpy as np
+from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+import onnxruntime as ort
+
+from main import preprocess_image, postprocess_detections
+
+MODEL_DIR = os.path.join("models", "human+phone")
+FP32_MODEL_PATH = os.path.join(MODEL_DIR, "model.onnx")
+INT8_MODEL_PATH = os.path.join(MODEL_DIR, "model.int8.onnx")
+
+MAX_CALIBRATION_FRAMES = 200  # Frames fed to the calibrator; the rest are held out
+HOLDOUT_FRACTION = 0.2  # Share of samples kept aside to compare FP32 vs INT8 detections
+
+def load_frame(path):
+    """Read a sample image and preprocess it exactly like /detect-humans does"""
+    image = cv2.imread(path)
+    if image is None:
+        return None
+    # A unique room per file keeps the screen-mask cache from leaking between samples
+    return preprocess_image(image, room=path)
+
+class FrameCalibrationReader(CalibrationDataReader):
+    """Feeds preprocessed sample frames to the static quantizer"""
+
+    def __init__(self, image_paths, input_name):
+        self.image_paths = iter(image_paths)
+        self.input_name = input_name
+
+    def get_next(self):
+        for path in self.image_paths:
+            tensor = load_frame(path)
+            if tensor is not None:
+                return {self.input_name: tensor}
+        return None
+
+def detect(session, tensor):
+    """Run one frame and return (human_confidences, phone_confidences)"""
+    boxes, logits, classes = session.run(None, {session.get_inputs()[0].name: tensor})
+    _, human_confidences, _, phone_confidences = postprocess_detections(boxes, logits, classes)
+    return human_confidences, phone_confidences
+
+def compare_on_holdout(image_paths):
+    """Check the INT8 model still finds the same people and phones as FP32"""
+    fp32 = ort.InferenceSession(FP32_MODEL_PATH, providers=["CPUExecutionProvider"])
+    int8 = ort.InferenceSession(INT8_MODEL_PATH, providers=["CPUExecutionProvider"])
+
+    frames = 0
+    count_matches = 0
+    confidence_drift = []
+
+    for path in image_paths:
+        tensor = load_frame(path)
+        if tensor is None:
+            continue
+
+        fp32_humans, fp32_phones = detect(fp32, tensor)
+        int8_humans, int8_phones = detect(int8, tensor)
+
+        frames += 1
+        if len(fp32_humans) == len(int8_humans) and len(fp32_phones) == len(int8_phones):
+            count_matches += 1
+        for ref, quant in ((fp32_humans, int8_humans), (fp32_phones, int8_phones)):
+            if len(ref) and len(quant):
+                confidence_drift.append(abs(float(ref.max()) - float(quant.max())))
+
+    if frames == 0:
+        print("⚠️ No holdout frames to compare")
+        return
+
+    print(f"\n📊 Holdout comparison ({frames} frames):")
+    print(f"   Same person/phone counts: {count_matches}/{frames} ({count_matches / frames:.1%})")
+    if confidence_drift:
+        print(f"   Mean top-confidence drift: {np.mean(confidence_drift):.3f}")
+    if count_matches < frames:
+        print("⚠️ Detections changed on some frames - review before deploying model.int8.onnx")
+
+def main():
+    print("🔢 DETR INT8 Quantization Tool")
+    print("=" * 50)
+
+    sample_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join("samples", "normal")
+
+    if not os.path.exists(FP32_MODEL_PATH):
+        print(f"❌ Model file not found: {FP32_MODEL_PATH}")
+        return
+    if not os.path.isdir(sample_dir):
+        print(f"❌ Sample folder not found: {sample_dir}")
+        return
+
+    image_paths = sorted(
+        os.path.join(sample_dir, f) for f in os.listdir(sample_dir)
+        if f.lower().endswith(('.png', '.jpg', '.jpeg'))
+    )
+    if len(image_paths) < 2:
+        print(f"❌ Need at least 2 images in {sample_dir}/ (found {len(image_paths)})")
+        return
+
+    holdout_count = max(1, int(len(image_paths) * HOLDOUT_FRACTION))
+    holdout_paths = image_paths[-holdout_count:]
+    calibration_paths = image_paths[:-holdout_count][:MAX_CALIBRATION_FRAMES]
+
+    print(f"\n📂 {len(calibration_paths)} calibration frames, {len(holdout_paths)} holdout frames")
+
+    input_name = ort.InferenceSession(
+        FP32_MODEL_PATH, providers=["CPUExecutionProvider"]
+    ).get_inputs()[0].name
+
+    print("\n⚙️ Calibrating and quantizing Conv/MatMul weights (per-channel QInt8)...")
+    quantize_static(
+        FP32_MODEL_PATH,
+        INT8_MODEL_PATH,
+        FrameCalibrationReader(calibration_paths, input_name),
+        quant_format=QuantFormat.QDQ,
+        op_types_to_quantize=["Conv", "MatMul"],
+        per_channel=True,
+        activation_type=QuantType.QInt8,
+        weight_type=QuantType.QInt8,
+    )
+
+    print(f"✅ Quantized model saved to {INT8_MODEL_PATH}")
+
+    compare_on_holdout(holdout_paths)
+
+    print("\n🚀 Restart the ML service to load the INT8 model")
+
+if __name__ == "__main__":
+    main()
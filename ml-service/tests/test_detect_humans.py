@@ -0,0 +1,71 @@
+"""
+Endpoint tests for /detect-humans and /detect-humans-raw
+Run from ml-service with: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+try:
+    from fastapi.testclient import TestClient
+except ImportError:  # httpx is optional - only the test client needs it
+    TestClient = None
+
+@unittest.skipIf(TestClient is None, "fastapi.testclient needs httpx")
+class DetectHumansTest(unittest.TestCase):
+    """Requests that fail before inference, so no model has to be loaded"""
+
+    def setUp(self):
+        # Only checked for None by the endpoints; no lifespan runs, so no model is loaded
+        self._session = main.session
+        main.session = object()
+        self.client = TestClient(main.app)
+
+    def tearDown(self):
+        main.session = self._session
+        main.room_state.clear()
+
+    def test_raw_bad_body_is_400(self):
+        response = self.client.post("/detect-humans-raw", content=b"not a jpeg",
+                                    headers={"Content-Type": "application/octet-stream"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_json_bad_image_is_400(self):
+        response = self.client.post("/detect-humans", json={"data": "bm90IGEganBlZw==", "timestamp": 1})
+        self.assertEqual(response.status_code, 400)
+
+    def _start_dwell(self, room):
+        # Both alerts sent with detections on record: the next frame is not decoded
+        state = main.get_room_state(room)
+        state.human_alert_sent = state.phone_alert_sent = True
+        state.detections = (np.empty((0, 4), np.float32), np.empty(0, np.float32),
+                            np.empty((0, 4), np.float32), np.empty(0, np.float32))
+        state.frame_count = 0
+        # Dwell frames must be answered without ever reaching the decoder
+        patcher = mock.patch.object(main, "decode_and_detect", side_effect=AssertionError("frame was decoded"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_dwell_bad_body_is_400(self):
+        self._start_dwell("dwell")
+        response = self.client.post("/detect-humans-raw", content=b"not a jpeg", headers={"X-Room": "dwell"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_dwell_replays_detections(self):
+        self._start_dwell("dwell")
+        jpeg = cv2.imencode(".jpg", np.zeros((48, 64, 3), np.uint8))[1].tobytes()
+        response = self.client.post("/detect-humans-raw", content=jpeg, headers={"X-Room": "dwell"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["humans_detected"], 0)
+
+if __name__ == "__main__":
+    unittest.main()